@@ -1,5 +1,4 @@
 import React, { useState, useEffect } from "react";
-import axios from "axios";
 
 const MarketCard = () => {
     const [marketData, setMarketData] = useState(() => {
@@ -22,42 +21,62 @@ const MarketCard = () => {
     });
 
     useEffect(() => {
-        const fetchMarketData = async () => {
-            try {
-                const response = await axios.get(
-                    `${import.meta.env.VITE_API_BASE_URL}/market/market-summary`
-                );
+        // Latest summaries received from the stream, updated by deltas
+        const summaries = {};
 
-                const { nifty_50, sensex } = response.data;
+        const applySummaries = () => {
+            const { nifty_50, sensex } = summaries;
+            if (!nifty_50 || !sensex) {
+                return;
+            }
+
+            const updatedData = {
+                nifty50: {
+                    price: nifty_50.current_price,
+                    change: nifty_50.current_price - nifty_50.previous_close,
+                    percentChange:
+                        ((nifty_50.current_price - nifty_50.previous_close) /
+                            nifty_50.previous_close) *
+                        100,
+                },
+                sensex: {
+                    price: sensex.current_price,
+                    change: sensex.current_price - sensex.previous_close,
+                    percentChange:
+                        ((sensex.current_price - sensex.previous_close) /
+                            sensex.previous_close) *
+                        100,
+                },
+                lastUpdatedAt: new Date(),
+            };
 
-                const updatedData = {
-                    nifty50: {
-                        price: nifty_50.current_price,
-                        change: nifty_50.current_price - nifty_50.previous_close,
-                        percentChange:
-                            ((nifty_50.current_price - nifty_50.previous_close) /
-                                nifty_50.previous_close) *
-                            100,
-                    },
-                    sensex: {
-                        price: sensex.current_price,
-                        change: sensex.current_price - sensex.previous_close,
-                        percentChange:
-                            ((sensex.current_price - sensex.previous_close) /
-                                sensex.previous_close) *
-                            100,
-                    },
-                    lastUpdatedAt: new Date(),
-                };
+            setMarketData(updatedData);
+            localStorage.setItem("marketData", JSON.stringify(updatedData));
+        };
 
-                setMarketData(updatedData);
-                localStorage.setItem("marketData", JSON.stringify(updatedData));
-            } catch (error) {
-                console.error("Error fetching market data:", error);
-            }
+        // One shared server-side producer pushes updates instead of polling
+        const source = new EventSource(
+            `${import.meta.env.VITE_API_BASE_URL}/market/stream`
+        );
+
+        source.addEventListener("snapshot", (event) => {
+            Object.assign(summaries, JSON.parse(event.data).market);
+            applySummaries();
+        });
+
+        source.addEventListener("market", (event) => {
+            const { changed, removed } = JSON.parse(event.data);
+            Object.assign(summaries, changed);
+            removed.forEach((name) => delete summaries[name]);
+            applySummaries();
+        });
+
+        source.onerror = (error) => {
+            // EventSource reconnects on its own and receives a fresh snapshot
+            console.error("Market stream error:", error);
         };
 
-        fetchMarketData();
+        return () => source.close();
     }, []);
 
     return (
@@ -1,6 +1,5 @@
-import React, { useState } from "react";
+import React, { useRef, useState } from "react";
 import axios from "axios";
-import nseEqData from "./nse_eq.json";
 
 const StockSearchCard = () => {
     const [ticker, setTicker] = useState("");
@@ -8,17 +7,27 @@ const StockSearchCard = () => {
     const [marketData, setMarketData] = useState(null);
     const [error, setError] = useState(null);
     const [loading, setLoading] = useState(false);
+    const latestQuery = useRef("");
 
-    const handleInputChange = (e) => {
+    const handleInputChange = async (e) => {
         const input = e.target.value;
         setTicker(input);
+        latestQuery.current = input;
 
-        // Filter suggestions based on the input
+        // Fetch suggestions from the server-side symbol index
         if (input) {
-            const filteredSuggestions = nseEqData.filter((stock) =>
-                stock?.SEM_TRADING_SYMBOL?.toLowerCase().startsWith(input.toLowerCase())
-            );
-            setSuggestions(filteredSuggestions.slice(0, 10)); // Limit to 10 suggestions
+            try {
+                const response = await axios.get(
+                    `${import.meta.env.VITE_API_BASE_URL}/market/symbols/search`,
+                    { params: { q: input, limit: 10 } } // Limit to 10 suggestions
+                );
+                // Ignore responses for input the user has already changed
+                if (latestQuery.current === input) {
+                    setSuggestions(response.data.results);
+                }
+            } catch (err) {
+                console.error("Error fetching symbol suggestions:", err);
+            }
         } else {
             setSuggestions([]);
         }
@@ -122,7 +131,7 @@ const StockSearchCard = () => {
                                 <td className={`px-4 py-2 border-b text-sm ${marketData.percent_change >= 0
                                     ? "text-green-500"
                                     : "text-red-500"
-                                    }`}>₹{marketData.current_price.toLocaleString()} ({marketData.percent_change.toFixed(2)}%)</td>
+                                    }`}>₹{marketData.current_price.toLocaleString()} ({marketData.percent_change.toFixed(2)}%){marketData.price_stale && " (delayed)"}</td>
                             </tr>
                             <tr>
                                 <td className="px-4 py-2 border-b font-semibold text-sm">Previous Close</td>
@@ -32,13 +32,46 @@ const Scanner = () => {
         fetchScanners();
     }, []);
 
+    // Fetch details for every row in one request so expanding a row is instant
+    const enrichStocks = async (stocks) => {
+        const symbols = stocks.map((stock) => stock.Symbol).filter(Boolean);
+        if (symbols.length === 0) {
+            return;
+        }
+        try {
+            const response = await axios.post(`${baseUrl}/market/stock-details`, {
+                symbols,
+            });
+            setStockDetails((prevDetails) => ({
+                ...prevDetails,
+                ...response.data.details,
+            }));
+        } catch (error) {
+            console.error("Error fetching stock details:", error);
+        }
+    };
+
     const fetchScannedStocks = async (scanner) => {
         setLoading(true);
         console.log("Fetching scanned stocks for:", scanner);
         try {
+            // Serve the last scheduled run from the store when there is one
+            const stored = await axios
+                .get(`${baseUrl}/scanner/results/latest/${scanner.scanner_id}`)
+                .catch(() => null);
+            if (stored) {
+                setScannedStocks(stored.data.rows);
+                enrichStocks(stored.data.rows);
+                const checkedAt = new Date(`${stored.data.checked_at}Z`).toLocaleString();
+                setLastUpdatedAt(checkedAt);
+                localStorage.setItem("lastUpdatedAt", checkedAt);
+                return;
+            }
+
             const requestBody = {
                 url: scanner.url,
                 table_id: scanner.table_id,
+                scrape_mode: scanner.scrape_mode,
             };
 
             const response = await axios.post(
@@ -47,6 +80,7 @@ const Scanner = () => {
             );
             console.log("Scanned stocks fetched:", response.data.data);
             setScannedStocks(response.data.data);
+            enrichStocks(response.data.data);
 
             // Save the last updated time on success
             const updatedTime = new Date().toLocaleString();
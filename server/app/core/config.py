@@ -8,9 +8,129 @@ class Settings:
     APP_NAME: str = os.getenv("APP_NAME", "FastAPIApp")
     DEBUG: bool = os.getenv("DEBUG", False)
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DATABASE_NAME: str = os.getenv("DATABASE_NAME", "stock_portfolio")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     CLIENT_URL: str = os.getenv("CLIENT_URL")
     DOCS_URL: str = os.getenv("DOCS_URL")
 
+    # Authentication
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
+        os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 60 * 24)
+    )
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", 10000))
+    # Each worker caches users separately, so a revoked token can still be
+    # accepted by other workers for up to this long
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", 10))
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12))
+    HASH_WORKERS: int = int(os.getenv("HASH_WORKERS", 2))
+
+    # MongoDB connection pool
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 60000))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000)
+    )
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", 10000))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(
+        os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000)
+    )
+
+    # Bulk ledger imports
+    BULK_MAX_ENTRIES: int = int(os.getenv("BULK_MAX_ENTRIES", 50000))
+    BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", 1000))
+    # Pending ledger entries older than this are applied by the next write
+    LEDGER_PENDING_GRACE_SECONDS: int = int(
+        os.getenv("LEDGER_PENDING_GRACE_SECONDS", 300)
+    )
+
+    # Headless browser pool
+    CHROME_BIN: str = os.getenv("CHROME_BIN", "/usr/bin/chromium")
+    CHROMEDRIVER_PATH: str = os.getenv("CHROMEDRIVER_PATH", "/usr/bin/chromedriver")
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", 2))
+    BROWSER_MAX_PAGES: int = int(os.getenv("BROWSER_MAX_PAGES", 50))
+    BROWSER_PAGE_TIMEOUT: float = float(os.getenv("BROWSER_PAGE_TIMEOUT", 10))
+    BROWSER_PAGE_LOAD_TIMEOUT: float = float(os.getenv("BROWSER_PAGE_LOAD_TIMEOUT", 30))
+    BROWSER_QUEUE_TIMEOUT: float = float(os.getenv("BROWSER_QUEUE_TIMEOUT", 60))
+
+    # HTTP-first scraping
+    SCRAPE_HTTP_TIMEOUT: float = float(os.getenv("SCRAPE_HTTP_TIMEOUT", 10))
+    SCRAPE_HTTP_POOL_SIZE: int = int(os.getenv("SCRAPE_HTTP_POOL_SIZE", 10))
+    SCRAPE_CACHE_TTL_SECONDS: float = float(os.getenv("SCRAPE_CACHE_TTL_SECONDS", 30))
+
+    # Scheduled scanning
+    SCAN_CONCURRENCY: int = int(os.getenv("SCAN_CONCURRENCY", 4))
+    SCHEDULER_LEASE_SECONDS: float = float(os.getenv("SCHEDULER_LEASE_SECONDS", 300))
+
+    # Live market stream
+    STREAM_MARKET_INTERVAL: float = float(os.getenv("STREAM_MARKET_INTERVAL", 15))
+    STREAM_SCANNER_INTERVAL: float = float(os.getenv("STREAM_SCANNER_INTERVAL", 60))
+    STREAM_QUEUE_SIZE: int = int(os.getenv("STREAM_QUEUE_SIZE", 32))
+    STREAM_KEEPALIVE_SECONDS: float = float(os.getenv("STREAM_KEEPALIVE_SECONDS", 15))
+
+    # Email notifications
+    SENDER_EMAIL: str = os.getenv("SENDER_EMAIL")
+    RECEIVER_EMAIL: str = os.getenv("RECEIVER_EMAIL", "")
+    EMAIL_PASSWORD: str = os.getenv("EMAIL_PASSWORD")
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    SMTP_TIMEOUT: float = float(os.getenv("SMTP_TIMEOUT", 30))
+    EMAIL_DIGEST: bool = os.getenv("EMAIL_DIGEST", "false").lower() == "true"
+    EMAIL_MAX_RETRIES: int = int(os.getenv("EMAIL_MAX_RETRIES", 3))
+    EMAIL_RETRY_BACKOFF: float = float(os.getenv("EMAIL_RETRY_BACKOFF", 2))
+
+    # Local OHLCV history store
+    HISTORY_STORE_DIR: str = os.getenv("HISTORY_STORE_DIR", "data/history")
+    HISTORY_REFRESH_SECONDS: float = float(os.getenv("HISTORY_REFRESH_SECONDS", 3600))
+
+    # Symbol search
+    SYMBOL_MASTER_PATH: str = os.getenv("SYMBOL_MASTER_PATH", "resources/nse_eq.json")
+    SYMBOL_MASTER_CHECK_SECONDS: float = float(
+        os.getenv("SYMBOL_MASTER_CHECK_SECONDS", 30)
+    )
+    SYMBOL_SEARCH_LIMIT: int = int(os.getenv("SYMBOL_SEARCH_LIMIT", 50))
+
+    # Metrics
+    EVENT_LOOP_LAG_INTERVAL: float = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", 0.5))
+
+    # Fundamentals cache
+    FUNDAMENTALS_CACHE_SIZE: int = int(os.getenv("FUNDAMENTALS_CACHE_SIZE", 2048))
+    FUNDAMENTALS_HOT_TTL_SECONDS: float = float(
+        os.getenv("FUNDAMENTALS_HOT_TTL_SECONDS", 3600)
+    )
+    FUNDAMENTALS_MAX_AGE_HOURS: float = float(
+        os.getenv("FUNDAMENTALS_MAX_AGE_HOURS", 36)
+    )
+    FUNDAMENTALS_CONCURRENCY: int = int(os.getenv("FUNDAMENTALS_CONCURRENCY", 4))
+    FUNDAMENTALS_BATCH_MAX: int = int(os.getenv("FUNDAMENTALS_BATCH_MAX", 100))
+    FUNDAMENTALS_REFRESH_CRON: str = os.getenv(
+        "FUNDAMENTALS_REFRESH_CRON", "0 7 * * 1-5"
+    )
+
+    # Quote cache
+    QUOTE_CACHE_SIZE: int = int(os.getenv("QUOTE_CACHE_SIZE", 512))
+    QUOTE_TTL_SECONDS: float = float(os.getenv("QUOTE_TTL_SECONDS", 15))
+    PREVIOUS_CLOSE_TTL_SECONDS: float = float(
+        os.getenv("PREVIOUS_CLOSE_TTL_SECONDS", 3600)
+    )
+
+    # HTTP caching and compression
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", 1024))
+    GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", 6))
+    ETAG_CACHE_SIZE: int = int(os.getenv("ETAG_CACHE_SIZE", 4096))
+    ETAG_TTL_SECONDS: float = float(os.getenv("ETAG_TTL_SECONDS", 300))
+
+    # Exports
+    EXPORT_WORKERS: int = int(os.getenv("EXPORT_WORKERS", 2))
+    EXPORT_TASKS_PER_WORKER: int = int(os.getenv("EXPORT_TASKS_PER_WORKER", 50))
+    EXPORT_CSV_CHUNK_ROWS: int = int(os.getenv("EXPORT_CSV_CHUNK_ROWS", 500))
+    EXPORT_PDF_MAX_ROWS: int = int(os.getenv("EXPORT_PDF_MAX_ROWS", 2000))
+    EXPORT_CACHE_TTL_SECONDS: int = int(os.getenv("EXPORT_CACHE_TTL_SECONDS", 3600))
+    EXPORT_RENDER_TIMEOUT_SECONDS: int = int(
+        os.getenv("EXPORT_RENDER_TIMEOUT_SECONDS", 300)
+    )
+
 
 settings = Settings()
@@ -0,0 +1,168 @@
+"""Declarative MongoDB index registry and query-plan diagnostics.
+
+Indexes are applied idempotently at application startup. To check that every
+query shape used by the routes is served by an index, run:
+
+    python -m app.core.indexes
+
+which applies the registry, runs explain() on each shape in QUERY_SHAPES and
+exits non-zero if any of them still needs a COLLSCAN.
+"""
+
+import asyncio
+import sys
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+# Collections that need creation options, created before their indexes
+COLLECTIONS = {
+    "scan_snapshots": {
+        "timeseries": {
+            "timeField": "ts",
+            "metaField": "scanner_id",
+            "granularity": "minutes",
+        }
+    },
+}
+
+INDEXES = {
+    "users": [
+        IndexModel([("contact_number", ASCENDING)], unique=True),
+    ],
+    "bank_accounts": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+    ],
+    "portfolios": [
+        IndexModel([("user_id", ASCENDING), ("symbol", ASCENDING)], unique=True),
+    ],
+    "transactions": [
+        # Statements are read per user, newest first
+        IndexModel(
+            [("user_id", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)]
+        ),
+        # Imported entries are deduplicated by their external reference
+        IndexModel(
+            [("user_id", ASCENDING), ("reference", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"reference": {"$type": "string"}},
+        ),
+        # Entries not yet applied to the balance; see services/ledger.py
+        IndexModel(
+            [("user_id", ASCENDING), ("pending", ASCENDING)],
+            partialFilterExpression={"pending": {"$exists": True}},
+        ),
+    ],
+    "chartlink_scanners": [
+        IndexModel([("scanner_id", ASCENDING)], unique=True),
+    ],
+    "alert_state": [
+        IndexModel([("symbol", ASCENDING)], unique=True),
+        IndexModel([("trading_day", ASCENDING)]),
+    ],
+    "scan_runs": [
+        IndexModel([("started_at", DESCENDING)]),
+    ],
+    "scan_snapshots": [
+        IndexModel([("scanner_id", ASCENDING), ("ts", DESCENDING)]),
+        IndexModel([("symbols", ASCENDING), ("ts", ASCENDING)]),
+    ],
+    "scan_latest": [
+        IndexModel([("scanner_id", ASCENDING)], unique=True),
+        IndexModel([("rows.Symbol", ASCENDING)]),
+    ],
+    "fundamentals": [
+        IndexModel([("symbol", ASCENDING)], unique=True),
+    ],
+    "job_runs": [
+        IndexModel([("job", ASCENDING), ("started_at", DESCENDING)]),
+    ],
+    "export_jobs": [
+        # Finished reports expire on their own; see services/export_jobs.py
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
+
+# (name, collection, filter, sort) for every indexed lookup the app performs
+QUERY_SHAPES = [
+    ("auth.login", "users", {"contact_number": "0"}, None),
+    ("bank.account", "bank_accounts", {"user_id": "0"}, None),
+    (
+        "bank.statement",
+        "transactions",
+        {"user_id": "0"},
+        [("date", DESCENDING), ("_id", DESCENDING)],
+    ),
+    ("bank.bulk_reference", "transactions", {"user_id": "0", "reference": "0"}, None),
+    ("bank.pending", "transactions", {"user_id": "0", "pending": {"$lt": 0}}, None),
+    ("portfolio.buy", "portfolios", {"user_id": "0", "symbol": "0"}, None),
+    ("portfolio.holdings", "portfolios", {"user_id": "0"}, None),
+    ("scanner.by_id", "chartlink_scanners", {"scanner_id": "0"}, None),
+    ("alerts.load", "alert_state", {"trading_day": "0"}, None),
+    ("scan.latest", "scan_latest", {"scanner_id": "0"}, None),
+    (
+        "scan.symbol_history",
+        "scan_snapshots",
+        {"symbols": "0", "ts": {"$gte": 0}},
+        [("ts", ASCENDING)],
+    ),
+    ("market.fundamentals", "fundamentals", {"symbol": {"$in": ["0"]}}, None),
+    ("scheduler.runs", "job_runs", {"job": "0"}, [("started_at", DESCENDING)]),
+]
+
+
+async def ensure_indexes(database):
+    """Create every registered index; existing identical indexes are a no-op."""
+    existing = await database.list_collection_names()
+    for collection, options in COLLECTIONS.items():
+        if collection in existing:
+            continue
+        try:
+            await database.create_collection(collection, **options)
+        except (CollectionInvalid, OperationFailure) as e:
+            print(f"Failed to create collection {collection}: {e}")
+
+    for collection, indexes in INDEXES.items():
+        try:
+            await database[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # e.g. duplicates blocking a unique index; keep serving regardless
+            print(f"Failed to create indexes on {collection}: {e}")
+
+
+def _plan_stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "outerStage", "innerStage"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def explain_queries(database) -> list[dict]:
+    """Explain each query shape and flag those whose winning plan scans."""
+    report = []
+    for name, collection, query, sort in QUERY_SHAPES:
+        cursor = database[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        plan = (await cursor.explain())["queryPlanner"]["winningPlan"]
+        stages = [stage for stage in _plan_stages(plan) if stage]
+        report.append(
+            {"query": name, "stages": stages, "collscan": "COLLSCAN" in stages}
+        )
+    return report
+
+
+async def main() -> int:
+    from app.db import db
+
+    await ensure_indexes(db)
+    report = await explain_queries(db)
+    for entry in report:
+        flag = "COLLSCAN" if entry["collscan"] else "ok"
+        print(f"{flag:8} {entry['query']:22} {' <- '.join(entry['stages'])}")
+    return 1 if any(entry["collscan"] for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,185 @@
+"""Minimal in-process metrics rendered in the Prometheus text format.
+
+Histograms and gauges are kept in memory per process and served by
+GET /metrics. Upstream calls are timed with `upstream_timer`, for example:
+
+    with upstream_timer("yfinance", "download"):
+        data = yf.download(...)
+"""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram keyed by label values."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labelvalues, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                labels = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, labelvalues, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {values[-1]}")
+            labels = _labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {values[-2]}")
+            lines.append(f"{self.name}_count{labels} {values[-1]}")
+        return lines
+
+
+class Gauge:
+    """Last-set value per label values."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+
+    def set(self, value: float, *labelvalues):
+        self._values[labelvalues] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response starts, by route template and status.",
+    ("method", "route", "status"),
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to external dependencies.",
+    ("upstream", "operation", "outcome"),
+)
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency reported by the driver.",
+    ("command", "outcome"),
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Hit ratio of in-process caches since startup.", ("cache",)
+)
+CACHE_ENTRIES = Gauge("cache_entries", "Entries held by in-process caches.", ("cache",))
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds", "Most recent delay of a scheduled event loop wakeup."
+)
+EVENT_LOOP_LAG_MAX = Gauge(
+    "event_loop_lag_max_seconds", "Largest event loop delay since the last scrape."
+)
+
+METRICS = [
+    REQUEST_LATENCY,
+    UPSTREAM_LATENCY,
+    MONGO_LATENCY,
+    CACHE_HIT_RATIO,
+    CACHE_ENTRIES,
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_MAX,
+]
+
+_max_lag = 0.0
+
+
+@contextmanager
+def upstream_timer(upstream: str, operation: str):
+    """Time one call to an external dependency, labelled by its outcome."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        UPSTREAM_LATENCY.observe(
+            time.perf_counter() - started, upstream, operation, outcome
+        )
+
+
+async def monitor_event_loop(interval: float):
+    """Measure how late the loop wakes up from a fixed sleep."""
+    global _max_lag
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - started - interval)
+        EVENT_LOOP_LAG.set(lag)
+        _max_lag = max(_max_lag, lag)
+
+
+def record_caches(caches: dict):
+    for name, cache in caches.items():
+        stats = cache.stats()
+        CACHE_HIT_RATIO.set(stats["hit_ratio"], name)
+        CACHE_ENTRIES.set(stats["size"], name)
+
+
+def render() -> str:
+    global _max_lag
+    EVENT_LOOP_LAG_MAX.set(_max_lag)
+    _max_lag = 0.0
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+def command_listener():
+    """A pymongo listener feeding MONGO_LATENCY; passed to the client at connect."""
+    from pymongo import monitoring
+
+    class MongoCommandListener(monitoring.CommandListener):
+        def started(self, event):
+            pass
+
+        def succeeded(self, event):
+            MONGO_LATENCY.observe(event.duration_micros / 1e6, event.command_name, "ok")
+
+        def failed(self, event):
+            MONGO_LATENCY.observe(
+                event.duration_micros / 1e6, event.command_name, "error"
+            )
+
+    return MongoCommandListener()
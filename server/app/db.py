@@ -1,19 +1,50 @@
-from pymongo import MongoClient
-from dotenv import load_dotenv
-import os
+from app.core.config import settings
 
-# Load environment variables from .env file
-load_dotenv()
+# The motor client is created by connect(), normally from the app lifespan
+client = None
+_database = None
 
-# MongoDB configuration
-MONGO_URI = os.getenv("DATABASE_URL")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "stock_portfolio")
 
-# Initialize MongoDB client
-client = MongoClient(MONGO_URI)
-db = client[DATABASE_NAME]
+def connect():
+    """Create the async MongoDB client; connections are opened lazily and pooled."""
+    global client, _database
+    if _database is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from app.core.metrics import command_listener
 
-db.users = db["users"]
-db.bank_accounts = db["bank_accounts"]
-db.portfolios = db["portfolios"]
-db.chartlink_scanners = db["chartlink_scanners"]
+        client = AsyncIOMotorClient(
+            settings.DATABASE_URL,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=settings.MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=settings.MONGO_SOCKET_TIMEOUT_MS,
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            # Times every command for /metrics
+            event_listeners=[command_listener()],
+        )
+        _database = client[settings.DATABASE_NAME]
+    return _database
+
+
+def close():
+    global client, _database
+    if client is not None:
+        client.close()
+    client = None
+    _database = None
+
+
+class LazyDatabase:
+    """Stands in for the motor database so modules can import `db` cheaply."""
+
+    def __getattr__(self, name):
+        return getattr(connect(), name)
+
+    def __getitem__(self, name):
+        return connect()[name]
+
+
+# Collections are reached as attributes, e.g. db.users or db.bank_accounts
+db = LazyDatabase()
@@ -1,18 +1,61 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import auth, bank, portfolio, market, scrape_table, scanner
+from fastapi.responses import ORJSONResponse
+from app.routes import (
+    auth,
+    bank,
+    portfolio,
+    market,
+    scrape_table,
+    scanner,
+    metrics,
+    exports,
+)
 from app.core.config import settings
-from fastapi_utilities import repeat_at, repeat_every
+from app.core.metrics import REQUEST_LATENCY, monitor_event_loop
+from app.core.indexes import ensure_indexes
+from app import db as database
+from app.services import export_jobs, fundamentals, scan_service
+from app.services.alert_state import AlertStateStore
+from app.services.live_feed import live_feed
+from app.services.notifier import email_dispatcher
+from app.services.scheduler import scheduler
+from app.services.symbol_index import symbol_index
+from app.utils.export import render_pool
+from app.utils.http_cache import CompressionMiddleware
 import os
 from dotenv import load_dotenv
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from datetime import datetime
-import pytz
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the database and apply the index registry before serving requests
+    await ensure_indexes(database.connect())
+    # Build the symbol search index once, off the event loop
+    await asyncio.to_thread(symbol_index.load)
+    email_dispatcher.start()
+    # Schedule the recurring jobs; a Mongo lease runs each tick only once
+    scheduler.start()
+    loop_monitor = asyncio.create_task(
+        monitor_event_loop(settings.EVENT_LOOP_LAG_INTERVAL)
+    )
+    yield
+    loop_monitor.cancel()
+    await scheduler.stop()
+    live_feed.close()
+    await export_jobs.close()
+    render_pool.close()
+    await email_dispatcher.stop()
+    scrape_table.close_scrapers()
+    database.close()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="Manage your stock portfolio",
@@ -26,6 +69,9 @@ app = FastAPI(
         "url": "https://www.apache.org/licenses/LICENSE-2.0.html",
     },
     docs_url=settings.DOCS_URL,
+    # orjson serializes large JSON bodies several times faster than json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -36,6 +82,33 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+    exclude_paths=("/market/stream",),
+)
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template so path parameters don't create new series
+        route = request.scope.get("route")
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - started,
+            request.method,
+            route.path if route is not None else "unmatched",
+            status,
+        )
+
+
 # Register the routes
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(bank.router, prefix="/bank", tags=["Bank Account"])
@@ -43,176 +116,78 @@ app.include_router(portfolio.router, prefix="/portfolio", tags=["Portfolio Manag
 app.include_router(market.router, prefix="/market", tags=["Market"])
 app.include_router(scrape_table.router, prefix="/scrape", tags=["Scrape Table"])
 app.include_router(scanner.router, prefix="/scanner", tags=["Chartlink Scanner"])
+app.include_router(exports.router, prefix="/exports", tags=["Exports"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 
-DATA_FILE = "percent_data.txt"  # File to store the previous percentage data
+# Last alerted % change per symbol, shared by all scheduled runs
+alert_state = AlertStateStore()
 
 
-@scanner.router.on_event("startup")
-@repeat_at(cron=os.getenv("CRON_JOB_TIME"))
+@scheduler.job("upper_circuit", cron=os.getenv("CRON_JOB_TIME"))
 async def get_upper_circuit():
     try:
-        url = "https://chartink.com/screener/btst-ema-rsi-volume-2"
-        table_id = "DataTables_Table_0"
-        table_data = scrape_table.scrape_table_to_json(url, table_id)
+        # Scrape every registered scanner concurrently, one row per symbol
+        run = await scan_service.run_scanners()
+        table_data = run["stocks"]
+        # Stream subscribers get these results without another scrape
+        live_feed.publish_scanner(table_data)
+
+        # Load today's alert state once for the whole run
+        await alert_state.load()
+
+        # Failed scanners and rows are reported in the job's run history
+        errors = [
+            f"{r['name']}: {r['error']}" for r in run["scanners"] if r["error"]
+        ]
 
         # Check and handle each stock's % Chg
+        alerts = []
         for stock in table_data:
             try:
                 percent_change = float(stock["% Chg"].strip("%"))
-                if should_send_email(stock["Symbol"], percent_change):
-                    send_email(stock)
-                    update_percent_data(stock["Symbol"], percent_change)
-            except ValueError as e:
-                print(f"Failed to process % Chg for {stock['Stock Name']}: {e}")
-
-        return {"data": table_data}
+                if alert_state.should_alert(stock["Symbol"], percent_change):
+                    alerts.append((stock, percent_change))
+            except (KeyError, ValueError) as e:
+                print(f"Failed to process % Chg for {stock.get('Stock Name')}: {e}")
+                errors.append(f"{stock.get('Symbol')}: {e}")
+
+        # Hand alerts to the background dispatcher instead of sending inline;
+        # each is recorded as sent only once delivered, so a failed send is
+        # retried by the next run
+        if settings.EMAIL_DIGEST:
+            try:
+                email_dispatcher.notify_digest(
+                    [stock for stock, _ in alerts],
+                    on_sent=partial(
+                        alert_state.record,
+                        {stock["Symbol"]: percent for stock, percent in alerts},
+                    ),
+                )
+            except Exception as e:
+                print(f"Failed to queue alert digest: {e}")
+                errors.append(f"digest: {e}")
+        else:
+            for stock, percent in alerts:
+                try:
+                    email_dispatcher.notify(
+                        stock,
+                        on_sent=partial(alert_state.record, {stock["Symbol"]: percent}),
+                    )
+                except Exception as e:
+                    print(f"Failed to queue alert for {stock.get('Symbol')}: {e}")
+                    errors.append(f"{stock.get('Symbol')}: {e}")
+
+        return {"rows": len(table_data), "errors": errors}
     except Exception as e:
         print(f"Failed to scrape table data: {str(e)}")
+        return {"errors": [str(e)]}
 
 
-def should_send_email(symbol, percent_change):
-    """Check if the email should be sent based on the percent change."""
-    previous_data = load_percent_data()
-    previous_percent = previous_data.get(symbol, None)
-
-    if previous_percent is None or percent_change >= previous_percent + 1:
-        return True
-    return False
-
-
-def update_percent_data(symbol, percent_change):
-    """Update the percent data for the symbol in the file."""
-    previous_data = load_percent_data()
-    previous_data[symbol] = percent_change
-
-    # Save the updated data back to the file
-    with open(DATA_FILE, "w") as f:
-        for sym, perc in previous_data.items():
-            f.write(f"{sym}:{perc}\n")
-
-
-def load_percent_data():
-    """Load the percent data from the file."""
-    if not os.path.exists(DATA_FILE):
-        return {}
-
-    data = {}
-    with open(DATA_FILE, "r") as f:
-        for line in f:
-            if ":" in line:
-                symbol, percent = line.strip().split(":")
-                data[symbol] = float(percent)
-    return data
-
-
-def send_email(stock):
-    """Send email notification if % Chg condition is met."""
-    sender_email = os.getenv("SENDER_EMAIL")
-    receiver_email = os.getenv("RECEIVER_EMAIL")
-    password = os.getenv("EMAIL_PASSWORD")
-
-    # Get the current time in UTC
-    utc_now = datetime.now(pytz.utc)
-
-    # Format the datetime in the desired format
-    formatted_time = utc_now.astimezone(pytz.timezone("Asia/Kolkata")).strftime(
-        "%d-%b %I:%M%p"
-    )
-    # Email content
-    subject = f"🚨 Stock Alert at {formatted_time}: {stock['Symbol']} 🚨"
-    body = f"""
-    <!DOCTYPE html>
-    <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    background-color: #f9f9f9;
-                    margin: 20px;
-                    color: #333;
-                }}
-                .container {{
-                    background-color: #fff;
-                    padding: 20px;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                }}
-                h2 {{
-                    color: #0056b3;
-                    margin-top: 0;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin: 20px 0;
-                }}
-                th, td {{
-                    border: 1px solid #ddd;
-                    padding: 10px;
-                    text-align: left;
-                }}
-                th {{
-                    background-color: #f4f4f4;
-                    color: #333;
-                }}
-                .footer {{
-                    margin-top: 20px;
-                    font-size: 0.9em;
-                    color: #555;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h2>Stock Alert</h2>
-                <p>The following stock has triggered your alert:</p>
-                <table>
-                    <tr>
-                        <th>Stock Name</th>
-                        <td>{stock['Stock Name']}</td>
-                    </tr>
-                    <tr>
-                        <th>Symbol</th>
-                        <td>{stock['Symbol']}</td>
-                    </tr>
-                    <tr>
-                        <th>Price</th>
-                        <td>{stock['Price']}</td>
-                    </tr>
-                    <tr>
-                        <th>% Change</th>
-                        <td>{stock['% Chg']}</td>
-                    </tr>
-                    <tr>
-                        <th>Volume</th>
-                        <td>{stock['Volume']}</td>
-                    </tr>
-                </table>
-                <div class="footer">
-                    <p>This is an automated notification. Please verify the details before making any trading decisions.</p>
-                </div>
-            </div>
-        </body>
-    </html>
-    """
-
-    # Create the email
-    msg = MIMEMultipart()
-    msg["From"] = sender_email
-    msg["To"] = receiver_email
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "html"))  # Attach HTML content
-
-    # Send the email
-    try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            server.starttls()
-            server.login(sender_email, password)
-            server.sendmail(sender_email, receiver_email.split(","), msg.as_string())
-            print(f"Email sent for stock: {stock['Stock Name']}")
-    except Exception as e:
-        print(f"Failed to send email: {e}")
+@scheduler.job("refresh_fundamentals", cron=settings.FUNDAMENTALS_REFRESH_CRON)
+async def refresh_fundamentals():
+    # Re-fetch stored fundamentals once a day so reads never wait on Yahoo
+    return await fundamentals.refresh_all()
 
 
 @app.get("/")
@@ -0,0 +1,47 @@
+"""Move transactions embedded in bank_accounts into the transactions collection.
+
+Run once after deploying the ledger collection:
+
+    python -m app.migrations.ledger
+
+Safe to re-run: entries are upserted, and an account's embedded array is only
+removed after its entries have been written.
+"""
+
+import asyncio
+from pymongo import UpdateOne
+from app.db import db
+
+
+async def migrate_embedded_transactions(batch_size: int = 1000) -> int:
+    migrated = 0
+    accounts = db.bank_accounts.find(
+        {"transactions.0": {"$exists": True}}, {"user_id": 1, "transactions": 1}
+    )
+    async for account in accounts:
+        operations = []
+        for transaction in account["transactions"]:
+            entry = {"user_id": account["user_id"], **transaction}
+            operations.append(UpdateOne(entry, {"$setOnInsert": entry}, upsert=True))
+
+        for i in range(0, len(operations), batch_size):
+            await db.transactions.bulk_write(
+                operations[i : i + batch_size], ordered=False
+            )
+
+        await db.bank_accounts.update_one(
+            {"_id": account["_id"]}, {"$unset": {"transactions": ""}}
+        )
+        migrated += len(operations)
+        print(f"Migrated {len(operations)} transactions for {account['user_id']}")
+
+    return migrated
+
+
+async def main():
+    migrated = await migrate_embedded_transactions()
+    print(f"Migrated {migrated} transactions in total")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
+# Stored in the `transactions` ledger collection, keyed by user_id
 class Transaction(BaseModel):
     type: str  # e.g., "deposit", "withdrawal", etc.
     amount: float
@@ -15,7 +16,13 @@ class BankAccount(BaseModel):
     account_balance: float = Field(..., description="Current balance in the account")
     currency: str = Field(..., description="Currency type (e.g., 'INR')")
     account_type: str = Field(..., description="Type of the account (e.g., 'Savings')")
-    transactions: List[Transaction] = Field(
-        default_factory=list,
-        description="List of transactions for the account",
+
+
+class LedgerEntry(BaseModel):
+    type: Literal["deposit", "withdrawal"]
+    amount: float = Field(..., gt=0)
+    date: Optional[datetime] = None
+    description: Optional[str] = None
+    reference: Optional[str] = Field(
+        None, description="External id; entries with a known reference are skipped"
     )
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+
+
+# Define the data model to return market summary
+class MarketSummary(BaseModel):
+    index_name: str
+    current_price: float
+    open_price: float
+    high_price: float
+    low_price: float
+    previous_close: float
+    volume: int
+
+
+def to_market_summary(quote: dict) -> MarketSummary:
+    # Fall back to the current price when no previous close is available
+    previous_close = quote["previous_close"]
+    if previous_close is None:
+        previous_close = quote["current_price"]
+
+    return MarketSummary(
+        index_name=quote["symbol"],
+        current_price=quote["current_price"],
+        open_price=quote["open_price"],
+        high_price=quote["high_price"],
+        low_price=quote["low_price"],
+        previous_close=previous_close,
+        volume=quote["volume"],
+    )
@@ -1,8 +1,15 @@
+from typing import Literal
 from pydantic import BaseModel
 
+# "auto" tries a plain HTTP fetch first and falls back to the browser. The
+# HTTP path reads server-rendered tables, and Chartink screeners through the
+# JSON endpoint their page calls; other client-rendered tables need "browser"
+ScrapeMode = Literal["auto", "http", "browser"]
+
 
 class ScannerItem(BaseModel):
     name: str
     url: str
     description: str
     table_id: str
+    scrape_mode: ScrapeMode = "auto"
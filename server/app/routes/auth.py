@@ -1,6 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends
 from app.models.user import User
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.utils.security import (
+    hash_password_async,
+    verify_and_update_password,
+    create_access_token,
+    invalidate_user,
+    hashing_pool,
+)
 from app.db import db
 import uuid
 
@@ -10,11 +16,11 @@ router = APIRouter()
 @router.post("/register")
 async def register(user: User):
     # Check if the user already exists
-    if db.users.find_one({"contact_number": user.contact_number}):
+    if await db.users.find_one({"contact_number": user.contact_number}):
         raise HTTPException(status_code=400, detail="User already exists")
 
     # Hash the user's password
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
 
     # Create user data
     user_data = user.dict()
@@ -22,7 +28,8 @@ async def register(user: User):
     del user_data["password"]  # Do not store plain-text password
 
     # Insert user into database
-    db.users.insert_one(user_data)
+    await db.users.insert_one(user_data)
+    invalidate_user(user.contact_number)
 
     # Automatically create a bank account for the user
     account_data = {
@@ -31,39 +38,61 @@ async def register(user: User):
         "account_balance": 0.0,  # Initial balance
         "currency": "INR",  # Default currency
         "account_type": "Savings",  # Default account type
-        "transactions": [],  # Empty transaction ledger
     }
-    db.bank_accounts.insert_one(account_data)
+    await db.bank_accounts.insert_one(account_data)
 
     return {"message": "User registered successfully and bank account created"}
 
 
 @router.post("/login")
 async def login(contact_number: str, password: str):
-    stored_user = db.users.find_one({"contact_number": contact_number})
+    stored_user = await db.users.find_one({"contact_number": contact_number})
     if not stored_user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not verify_password(password, stored_user["hashed_password"]):
+    valid, new_hash = await verify_and_update_password(
+        password, stored_user["hashed_password"]
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token({"sub": stored_user["contact_number"]})
+    # Upgrade hashes made with an outdated cost factor
+    if new_hash:
+        await db.users.update_one(
+            {"contact_number": contact_number},
+            {"$set": {"hashed_password": new_hash}},
+        )
+        invalidate_user(contact_number)
+
+    token = create_access_token(
+        {
+            "sub": stored_user["contact_number"],
+            "ver": stored_user.get("token_version", 0),
+        }
+    )
     return {"access_token": token, "token_type": "bearer"}
 
 
 @router.post("/forgot-password")
 async def forgot_password(contact_number: str, new_password: str):
     # Check if the user exists
-    user = db.users.find_one({"contact_number": contact_number})
+    user = await db.users.find_one({"contact_number": contact_number})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Hash the new password
-    hashed_password = hash_password(new_password)
+    hashed_password = await hash_password_async(new_password)
 
-    # Update the password in the database
-    db.users.update_one(
+    # Update the password and revoke tokens issued with the old one
+    await db.users.update_one(
         {"contact_number": contact_number},
-        {"$set": {"hashed_password": hashed_password}},
+        {"$set": {"hashed_password": hashed_password}, "$inc": {"token_version": 1}},
     )
+    invalidate_user(contact_number)
     return {"message": "Password updated successfully"}
+
+
+@router.get("/hashing-stats")
+async def get_hashing_stats():
+    """Expose password hashing pool usage for sizing HASH_WORKERS."""
+    return hashing_pool.stats()
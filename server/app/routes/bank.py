@@ -1,6 +1,16 @@
-from fastapi import APIRouter, HTTPException, Depends
-from app.models.bank_account import BankAccount
+import json
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.models.bank_account import BankAccount, LedgerEntry
 from app.db import db
+from app.services import export_jobs, ledger, versions
+from app.utils import export
+from app.utils.http_cache import Validator, conditional_get
 from app.utils.security import get_current_user
 from datetime import datetime
 
@@ -13,44 +23,217 @@ async def deposit(amount: float, current_user: dict = Depends(get_current_user))
         raise HTTPException(status_code=400, detail="Amount must be positive")
 
     contact_number = current_user.get("contact_number")
-
-    # Find the user's bank account
-    account = db.bank_accounts.find_one({"user_id": contact_number})
+    account = await db.bank_accounts.find_one({"user_id": contact_number}, {"_id": 1})
     if not account:
         raise HTTPException(status_code=404, detail="Bank account not found")
+    await ledger.settle_stale(contact_number)
 
-    # Update account balance
-    new_balance = account["account_balance"] + amount
-    db.bank_accounts.update_one(
-        {"user_id": contact_number}, {"$set": {"account_balance": new_balance}}
-    )
-
-    # Add a transaction record
+    # Record the transaction first, then apply it to the balance once
+    pending = ObjectId()
     transaction = {
+        "user_id": contact_number,
         "type": "deposit",
         "amount": amount,
         "date": datetime.utcnow(),
         "description": "Deposit to account",
+        "pending": pending,
     }
-    db.bank_accounts.update_one(
-        {"user_id": contact_number}, {"$push": {"transactions": transaction}}
+    await db.transactions.insert_one(transaction)
+    account = await ledger.settle(contact_number, pending)
+    await versions.bump(versions.ledger(contact_number))
+
+    return {"message": "Deposit successful", "new_balance": account["account_balance"]}
+
+
+async def apply_ledger_batch(
+    user_id: str, entries: list[LedgerEntry], pending: ObjectId
+) -> dict:
+    """Write one batch unordered, tagged `pending`, and report which were written."""
+    now = datetime.utcnow()
+    operations = []
+    for entry in entries:
+        transaction = {"user_id": user_id, **entry.dict(exclude_none=True)}
+        transaction["pending"] = pending
+        transaction.setdefault("date", now)
+        transaction.setdefault("description", f"Imported {entry.type}")
+        if entry.reference is None:
+            operations.append(InsertOne(transaction))
+        else:
+            # Skip references that were already imported
+            operations.append(
+                UpdateOne(
+                    {"user_id": user_id, "reference": entry.reference},
+                    {"$setOnInsert": transaction},
+                    upsert=True,
+                )
+            )
+
+    errors = {}
+    try:
+        result = await db.transactions.bulk_write(operations, ordered=False)
+        upserted = result.upserted_ids
+    except BulkWriteError as e:
+        upserted = {u["index"]: u["_id"] for u in e.details["upserted"]}
+        errors = {w["index"]: w["errmsg"] for w in e.details["writeErrors"]}
+
+    applied = [
+        i
+        for i, entry in enumerate(entries)
+        if i not in errors and (entry.reference is None or i in upserted)
+    ]
+    return {"applied": len(applied), "errors": list(errors.values())}
+
+
+@router.post("/transactions/bulk")
+async def bulk_transactions(
+    entries: list[LedgerEntry], current_user: dict = Depends(get_current_user)
+):
+    """Import ledger entries in unordered batches and apply their net amount."""
+    if len(entries) > settings.BULK_MAX_ENTRIES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BULK_MAX_ENTRIES} entries per request",
+        )
+
+    contact_number = current_user.get("contact_number")
+    account = await db.bank_accounts.find_one(
+        {"user_id": contact_number}, {"account_balance": 1}
     )
+    if not account:
+        raise HTTPException(status_code=404, detail="Bank account not found")
+
+    await ledger.settle_stale(contact_number)
 
-    return {"message": "Deposit successful", "new_balance": new_balance}
+    applied, errors = 0, []
+    try:
+        for i in range(0, len(entries), settings.BULK_BATCH_SIZE):
+            # Apply each batch's entries as soon as they are written, even if
+            # the write failed part-way; a retry skips them by reference, and
+            # anything left pending is applied by the user's next write
+            pending = ObjectId()
+            try:
+                batch = await apply_ledger_batch(
+                    contact_number, entries[i : i + settings.BULK_BATCH_SIZE], pending
+                )
+            finally:
+                account = await ledger.settle(contact_number, pending)
+            applied += batch["applied"]
+            errors.extend(batch["errors"])
+    finally:
+        await versions.bump(versions.ledger(contact_number))
+
+    return {
+        "received": len(entries),
+        "applied": applied,
+        "skipped": len(entries) - applied - len(errors),
+        "errors": errors[:20],
+        "new_balance": account["account_balance"],
+    }
+
+
+async def statement_validator(
+    request: Request, current_user: dict = Depends(get_current_user)
+) -> Validator:
+    return await conditional_get(
+        request,
+        versions.ledger(current_user.get("contact_number")),
+        cache_control="private, no-cache",
+    )
 
 
 @router.get("/statement")
-async def get_statement(current_user: dict = Depends(get_current_user)):
+async def get_statement(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    current_user: dict = Depends(get_current_user),
+    validator: Validator = Depends(statement_validator),
+):
     contact_number = current_user.get("contact_number")
 
     # Find the user's bank account
-    account = db.bank_accounts.find_one({"user_id": contact_number})
+    account = await db.bank_accounts.find_one({"user_id": contact_number})
     if not account:
         raise HTTPException(status_code=404, detail="Bank account not found")
 
-    # Return the transactions
-    return {
-        "account_number": account["account_number"],
-        "account_balance": account["account_balance"],
-        "transactions": account["transactions"],
-    }
+    try:
+        query = ledger.build_query(contact_number, start, end, cursor)
+    except (ValueError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Return one page of transactions, newest first
+    transactions, next_cursor = await ledger.get_page(query, limit)
+    return validator.respond(
+        {
+            "account_number": account["account_number"],
+            "account_balance": account["account_balance"],
+            "transactions": transactions,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@router.get("/statement/stream")
+async def stream_statement(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Stream the full statement as NDJSON, one transaction per line."""
+    query = ledger.build_query(current_user.get("contact_number"), start, end)
+
+    async def lines():
+        async for transaction in ledger.iter_transactions(query):
+            transaction["date"] = transaction["date"].isoformat()
+            yield json.dumps(transaction) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/statement/export")
+async def export_statement(
+    format: export.ExportFormat = "csv",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    current_user: dict = Depends(get_current_user),
+):
+    """Stream the statement as CSV, or start a PDF report job and return its id."""
+    contact_number = current_user.get("contact_number")
+    query = ledger.build_query(contact_number, start, end)
+
+    if format == "csv":
+        return StreamingResponse(
+            export.csv_stream(export.STATEMENT_COLUMNS, ledger.iter_transactions(query)),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="statement.csv"'},
+        )
+
+    account = await db.bank_accounts.find_one(
+        {"user_id": contact_number},
+        {"_id": 0, "account_number": 1, "account_balance": 1},
+    )
+    if not account:
+        raise HTTPException(status_code=404, detail="Bank account not found")
+
+    async def build():
+        transactions = await ledger.find_transactions(
+            query, limit=settings.EXPORT_PDF_MAX_ROWS + 1
+        ).to_list(None)
+        truncated = len(transactions) > settings.EXPORT_PDF_MAX_ROWS
+        content = await export.render_pool.run(
+            export.render_statement_pdf,
+            account,
+            transactions[: settings.EXPORT_PDF_MAX_ROWS],
+            truncated,
+        )
+        return "statement.pdf", "application/pdf", content
+
+    job = await export_jobs.submit(
+        "statement.pdf",
+        contact_number,
+        versions.ledger(contact_number),
+        {"start": start, "end": end},
+        build,
+    )
+    return ORJSONResponse(job, status_code=202)
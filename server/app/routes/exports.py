@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Depends, Response
+from app.services import export_jobs
+from app.utils.security import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+async def get_export(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Status of an export job started by /bank/statement/export or /portfolio/export."""
+    job = await export_jobs.get(job_id, current_user.get("contact_number"))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return job
+
+
+@router.get("/{job_id}/download")
+async def download_export(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await export_jobs.download(job_id, current_user.get("contact_number"))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found or not ready")
+    return Response(
+        bytes(job["content"]),
+        media_type=job["media_type"],
+        headers={"Content-Disposition": f'attachment; filename="{job["filename"]}"'},
+    )
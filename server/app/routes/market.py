@@ -1,60 +1,32 @@
-import yfinance as yf
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
+from app.services import fundamentals
+from app.services.history_store import INTERVALS, history_store
+from app.services.live_feed import live_feed
+from app.core.config import settings
+from app.models.market import MarketSummary, to_market_summary
+from app.services.stock_service import fetch_quotes, quote_cache
+from app.services.symbol_index import symbol_index
+from app.utils.http_cache import Validator
 
 router = APIRouter()
 
 
-# Define the data model to return market summary
-class MarketSummary(BaseModel):
-    index_name: str
-    current_price: float
-    open_price: float
-    high_price: float
-    low_price: float
-    previous_close: float
-    volume: int
-
-
-def get_market_data(index_symbol: str) -> MarketSummary:
+def get_market_data_batch(index_symbols: list[str]) -> dict[str, MarketSummary]:
+    """Fetch market data for all symbols with a single batched download."""
     try:
-        # Fetch daily data using yfinance
-        index = yf.Ticker(index_symbol)
-        data = index.history(period="1d")  # Get only the latest day's data
-
-        if data.empty:
-            raise ValueError(f"No data returned for symbol: {index_symbol}")
-
-        # Get the latest row (today's data)
-        latest_data = data.iloc[-1]
+        quotes = fetch_quotes(index_symbols)
 
-        # Current price is the close price of the latest data, rounded to 2 decimal places
-        current_price = round(latest_data["Close"], 2)
+        missing = [symbol for symbol in index_symbols if symbol not in quotes]
+        if missing:
+            raise ValueError(f"No data returned for symbol: {', '.join(missing)}")
 
-        # Get the previous day's data (which is the second latest record)
-        previous_data = index.history(period="5d").iloc[-2]  # Fetch two days' data
-
-        # Previous close is rounded to 2 decimal places
-        previous_close = (
-            round(previous_data["Close"], 2)
-            if previous_data is not None
-            else current_price
-        )
-
-        # Check for volume (in case it's missing)
-        volume = latest_data.get("Volume", 0)
-
-        # Return the response as a Pydantic model
-        return MarketSummary(
-            index_name=index_symbol,
-            current_price=current_price,
-            open_price=round(latest_data["Open"], 2),
-            high_price=round(latest_data["High"], 2),
-            low_price=round(latest_data["Low"], 2),
-            previous_close=previous_close,
-            volume=volume,
-        )
+        return {symbol: to_market_summary(quotes[symbol]) for symbol in index_symbols}
     except ValueError as ve:
         raise HTTPException(
             status_code=500, detail=f"Error fetching market data: {str(ve)}"
@@ -63,6 +35,10 @@ def get_market_data(index_symbol: str) -> MarketSummary:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 
+def get_market_data(index_symbol: str) -> MarketSummary:
+    return get_market_data_batch([index_symbol])[index_symbol]
+
+
 def get_cap_category(market_cap):
     LARGE_CAP_THRESHOLD = 20000 * 1e7
     MID_CAP_THRESHOLD = 5000 * 1e7
@@ -77,71 +53,241 @@ def get_cap_category(market_cap):
 
 
 @router.get("/market-summary")
-async def get_market_summary():
+async def get_market_summary(request: Request):
     try:
-        # Fetch market data for Nifty 50 and Sensex
-        nifty_data = get_market_data("^NSEI")  # Nifty 50
-        sensex_data = get_market_data("^BSESN")  # Sensex
+        # Fetch Nifty 50 and Sensex in one round trip, off the event loop so
+        # concurrent requests share one upstream fetch
+        data = await run_in_threadpool(get_market_data_batch, ["^NSEI", "^BSESN"])
 
-        # Return data as a Pydantic model
-        return {"nifty_50": nifty_data, "sensex": sensex_data}
+        # Quotes are cached, so polls within the TTL hash to the same ETag
+        return Validator(request, "market-summary").respond(
+            {"nifty_50": data["^NSEI"].dict(), "sensex": data["^BSESN"].dict()}
+        )
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error fetching market data")
 
 
+@router.get("/stream")
+async def stream_market():
+    """Server-Sent Events: a snapshot, then market and scanner deltas."""
+
+    async def events():
+        queue = live_feed.subscribe()
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(), settings.STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                payload = json.dumps(data, default=str)
+                yield f"id: {data['version']}\nevent: {event}\ndata: {payload}\n\n"
+        finally:
+            live_feed.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stream-stats")
+async def get_stream_stats():
+    return live_feed.stats()
+
+
+@router.get("/quotes")
+async def get_quotes(symbols: str):
+    """Return quotes for a comma-separated list of symbols in one batched fetch."""
+    symbol_list = list(
+        dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip())
+    )
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+
+    try:
+        quotes = await run_in_threadpool(fetch_quotes, symbol_list)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching market data: {str(e)}"
+        )
+
+    return {
+        "quotes": [to_market_summary(quotes[s]) for s in symbol_list if s in quotes],
+        "missing": [s for s in symbol_list if s not in quotes],
+    }
+
+
+def load_history(symbol: str, interval: str, start, end) -> dict:
+    try:
+        history_store.sync(symbol, interval)
+    except Exception as e:
+        # Serve whatever is stored if the incremental fetch fails
+        print(f"Failed to sync history for {symbol}: {e}")
+
+    bars = history_store.range(symbol, interval, start, end)
+    return {name: column.tolist() for name, column in bars.items()}
+
+
+@router.get("/history")
+async def get_history(
+    symbol: str,
+    interval: str = "1d",
+    start: datetime | None = None,
+    end: datetime | None = None,
+):
+    """Serve OHLCV bars from the local store, fetching only bars it is missing."""
+    if interval not in INTERVALS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported interval, use one of: {', '.join(INTERVALS)}",
+        )
+
+    bars = await run_in_threadpool(load_history, symbol.upper(), interval, start, end)
+    if not bars:
+        raise HTTPException(status_code=404, detail="No history available")
+
+    return {"symbol": symbol.upper(), "interval": interval, "bars": bars}
+
+
+@router.get("/symbols/search")
+async def search_symbols(q: str, limit: int = Query(10, ge=1)):
+    """Autocomplete NSE symbols by trading symbol or security name prefix."""
+    # Pick up a replaced instrument master without a restart
+    if symbol_index.is_stale():
+        await run_in_threadpool(symbol_index.load)
+
+    return {"results": symbol_index.search(q, min(limit, settings.SYMBOL_SEARCH_LIMIT))}
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Expose quote cache counters for tuning TTLs and size."""
+    return quote_cache.stats()
+
+
+NO_MARKET_CAP = "Market cap not available for the given symbol"
+
+
+def _info_value(info: dict, key: str, default):
+    value = info.get(key)
+    return default if value is None else value
+
+
+def build_stock_detail(index_symbol: str, info: dict, quote: dict | None) -> dict:
+    """Combine cached fundamentals with the latest quote into the detail shape."""
+    # Extract market cap
+    market_cap_raw = info.get("marketCap")
+    if market_cap_raw is None:
+        raise LookupError(NO_MARKET_CAP)
+
+    # Convert market cap to crores
+    market_cap_in_crores = market_cap_raw / 1e7
+
+    # Prices come from the short-lived quote cache; fundamentals change daily
+    if quote is not None:
+        current_price = quote["current_price"]
+        open_price = quote["open_price"]
+        volume = quote["volume"]
+        previous_close = quote["previous_close"] or _info_value(
+            info, "previousClose", "N/A"
+        )
+    else:
+        # No live quote: the fundamentals snapshot can be up to a day old, so
+        # the response flags these prices as stale
+        current_price = _info_value(info, "currentPrice", "N/A")
+        open_price = _info_value(info, "open", "N/A")
+        volume = _info_value(info, "volume", "N/A")
+        previous_close = _info_value(info, "previousClose", "N/A")
+    percent_change = (current_price - previous_close) / previous_close * 100
+
+    return {
+        "ticker": index_symbol.split(".")[0],
+        "stock_name": _info_value(info, "longName", "Unknown Stock Name"),
+        "market_cap_crores": round(market_cap_in_crores, 2),
+        "sector": _info_value(info, "sector", "Unknown Sector"),
+        "industry": _info_value(info, "industry", "Unknown Industry"),
+        "pe_ratio": _info_value(info, "trailingPE", "N/A"),
+        "previous_close": previous_close,
+        "52_week_range": f"{_info_value(info, 'fiftyTwoWeekLow', 'N/A')} - {_info_value(info, 'fiftyTwoWeekHigh', 'N/A')}",
+        "current_price": current_price,
+        "open_price": open_price,
+        "volume": volume,
+        "percent_change": round(percent_change, 2),
+        "price_stale": quote is None,
+        **get_cap_category(market_cap_raw),
+    }
+
+
+async def load_stock_details(symbols: list[str]) -> tuple[dict, dict]:
+    """Details keyed by ticker, plus errors, for NSE symbols in one pass."""
+    index_symbols = list(dict.fromkeys(f"{s.strip().upper()}.NS" for s in symbols))
+
+    # Fundamentals (bounded-parallel on misses) and one batched quote download
+    (infos, errors), quotes = await asyncio.gather(
+        fundamentals.get_infos(index_symbols),
+        run_in_threadpool(fetch_quotes, index_symbols),
+    )
+
+    details = {}
+    errors = {symbol.split(".")[0]: error for symbol, error in errors.items()}
+    for index_symbol, info in infos.items():
+        ticker = index_symbol.split(".")[0]
+        try:
+            details[ticker] = build_stock_detail(
+                index_symbol, info, quotes.get(index_symbol)
+            )
+        except Exception as e:
+            errors[ticker] = str(e)
+    return details, errors
+
+
 @router.post("/stock-detail")
 async def get_stock_detail(index_symbol: str):
     try:
-        index_symbol = f"{index_symbol.upper()}.NS"
+        details, errors = await load_stock_details([index_symbol])
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching market data: {str(e)}"
+        )
 
-        # Fetch ticker data
-        ticker = yf.Ticker(index_symbol)
-        ticker_info = ticker.info
+    ticker = index_symbol.strip().upper()
+    if ticker not in details:
+        error = errors.get(ticker, "No data returned")
+        if error == NO_MARKET_CAP:
+            raise HTTPException(status_code=404, detail=error)
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching market data: {error}"
+        )
+    return details[ticker]
 
-        # Extract market cap
-        market_cap_raw = ticker_info.get("marketCap")
-        if market_cap_raw is None:
-            raise HTTPException(
-                status_code=404, detail="Market cap not available for the given symbol"
-            )
 
-        # Extract stock name
-        stock_name = ticker_info.get("longName", "Unknown Stock Name")
-
-        # Convert market cap to crores
-        market_cap_in_crores = market_cap_raw / 1e7
-
-        # Extract other basic details
-        sector = ticker_info.get("sector", "Unknown Sector")
-        industry = ticker_info.get("industry", "Unknown Industry")
-        pe_ratio = ticker_info.get("trailingPE", "N/A")
-        previous_close = ticker_info.get("previousClose", "N/A")
-        week_52_range = f"{ticker_info.get('fiftyTwoWeekLow', 'N/A')} - {ticker_info.get('fiftyTwoWeekHigh', 'N/A')}"
-        current_price = ticker_info.get("currentPrice", "N/A")
-        open_price = ticker_info.get("open", "N/A")
-        volume = ticker_info.get("volume", "N/A")
-        percent_change = (current_price - previous_close) / previous_close * 100
-
-        return {
-            "ticker": index_symbol.split(".")[0],
-            "stock_name": stock_name,
-            "market_cap_crores": round(market_cap_in_crores, 2),
-            "sector": sector,
-            "industry": industry,
-            "pe_ratio": pe_ratio,
-            "previous_close": previous_close,
-            "52_week_range": week_52_range,
-            "current_price": current_price,
-            "open_price": open_price,
-            "volume": volume,
-            "percent_change": round(percent_change, 2),
-            **get_cap_category(market_cap_raw),
-        }
-    except HTTPException as e:
-        raise e
+class StockDetailsRequest(BaseModel):
+    symbols: list[str]
+
+
+@router.post("/stock-details")
+async def get_stock_details(request: StockDetailsRequest):
+    """Enrich a whole scanner table in one request."""
+    symbols = [s for s in request.symbols if s.strip()]
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols provided")
+    if len(symbols) > settings.FUNDAMENTALS_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.FUNDAMENTALS_BATCH_MAX} symbols per request",
+        )
+
+    try:
+        details, errors = await load_stock_details(symbols)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error fetching market data: {str(e)}"
         )
+    return {"details": details, "errors": errors}
@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+from app.routes.scrape_table import scrape_cache
+from app.services.fundamentals import fundamentals_cache
+from app.services.stock_service import quote_cache
+from app.utils.security import user_cache
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape endpoint for this process."""
+    metrics.record_caches(
+        {
+            "quotes": quote_cache,
+            "scrape": scrape_cache,
+            "users": user_cache,
+            "fundamentals": fundamentals_cache,
+        }
+    )
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
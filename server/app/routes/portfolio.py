@@ -1,7 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from app.core.config import settings
 from app.models.portfolio import PortfolioItem
-from app.services.stock_service import fetch_stock_price
+from app.services import export_jobs, versions
+from app.services.portfolio_service import value_holdings
+from app.services.stock_service import fetch_quotes, fetch_stock_price
 from app.db import db
+from app.utils import export
 from app.utils.security import get_current_user
 
 router = APIRouter()
@@ -9,19 +15,110 @@ router = APIRouter()
 
 @router.post("/buy")
 async def buy_stock(symbol: str, quantity: int, user: dict = Depends(get_current_user)):
-    stock_price = fetch_stock_price(symbol)
+    stock_price = await run_in_threadpool(fetch_stock_price, symbol)
     total_cost = stock_price * quantity
 
-    account = db.bank_accounts.find_one({"user_id": user["_id"]})
+    account = await db.bank_accounts.find_one({"user_id": user["_id"]})
     if not account or account["account_balance"] < total_cost:
         raise HTTPException(status_code=400, detail="Insufficient funds")
 
-    db.bank_accounts.update_one(
+    await db.bank_accounts.update_one(
         {"_id": account["_id"]}, {"$inc": {"account_balance": -total_cost}}
     )
-    db.portfolios.update_one(
+    await versions.bump(versions.ledger(account["user_id"]))
+    await db.portfolios.update_one(
         {"user_id": user["_id"], "symbol": symbol},
         {"$inc": {"quantity": quantity}, "$set": {"purchase_price": stock_price}},
         upsert=True,
     )
+    # After the write, so an export of the new version sees the new holdings
+    await versions.bump(versions.portfolio(str(user["_id"])))
     return {"message": f"Bought {quantity} shares of {symbol}"}
+
+
+@router.get("/holdings")
+async def get_holdings(user: dict = Depends(get_current_user)):
+    """Value every holding with one query and one batched quote fetch."""
+    holdings = await db.portfolios.find(
+        {"user_id": user["_id"]},
+        {"_id": 0, "symbol": 1, "quantity": 1, "purchase_price": 1},
+    ).to_list(None)
+
+    try:
+        quotes = await run_in_threadpool(
+            fetch_quotes, [holding["symbol"] for holding in holdings]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching market data: {str(e)}"
+        )
+
+    return await run_in_threadpool(value_holdings, holdings, quotes)
+
+
+async def value_batch(holdings: list[dict]) -> list[dict]:
+    """Value one batch of holdings; unpriced holdings keep null valuation fields."""
+    try:
+        quotes = await run_in_threadpool(
+            fetch_quotes, [holding["symbol"] for holding in holdings]
+        )
+    except Exception as e:
+        print(f"Failed to fetch quotes for export: {e}")
+        quotes = {}
+    valuation = await run_in_threadpool(value_holdings, holdings, quotes)
+    return valuation["holdings"]
+
+
+@router.get("/export")
+async def export_holdings(
+    format: export.ExportFormat = "csv", user: dict = Depends(get_current_user)
+):
+    """Stream valued holdings as CSV, or start a PDF report job and return its id."""
+    projection = {"_id": 0, "symbol": 1, "quantity": 1, "purchase_price": 1}
+
+    if format == "csv":
+
+        async def rows():
+            # Price the cursor's holdings a batch at a time as they arrive
+            batch = []
+            async for holding in db.portfolios.find(
+                {"user_id": user["_id"]}, projection
+            ).batch_size(settings.EXPORT_CSV_CHUNK_ROWS):
+                batch.append(holding)
+                if len(batch) == settings.EXPORT_CSV_CHUNK_ROWS:
+                    for row in await value_batch(batch):
+                        yield row
+                    batch = []
+            if batch:
+                for row in await value_batch(batch):
+                    yield row
+
+        return StreamingResponse(
+            export.csv_stream(export.HOLDING_EXPORT_COLUMNS, rows()),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="holdings.csv"'},
+        )
+
+    async def build():
+        holdings = await db.portfolios.find(
+            {"user_id": user["_id"]}, projection
+        ).to_list(None)
+        quotes = await run_in_threadpool(
+            fetch_quotes, [holding["symbol"] for holding in holdings]
+        )
+        valuation = await run_in_threadpool(value_holdings, holdings, quotes)
+        content = await export.render_pool.run(
+            export.render_holdings_pdf, user.get("name", ""), valuation
+        )
+        return "holdings.pdf", "application/pdf", content
+
+    # Prices are taken when the report renders; the cached job is replaced
+    # when holdings change or after EXPORT_CACHE_TTL_SECONDS
+    job = await export_jobs.submit(
+        "holdings.pdf",
+        user.get("contact_number"),
+        versions.portfolio(str(user["_id"])),
+        {},
+        build,
+    )
+    return ORJSONResponse(job, status_code=202)
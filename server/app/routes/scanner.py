@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from app.models.scanner import ScannerItem
+from datetime import datetime, timedelta
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from app.models.scanner import ScannerItem, ScrapeMode
 from app.db import db
+from app.services import scan_history, versions
+from app.services.live_feed import live_feed
+from app.utils.http_cache import Validator, conditional_get
 from pymongo.errors import DuplicateKeyError
 from bson.objectid import ObjectId
 from pydantic import BaseModel
@@ -11,14 +15,12 @@ class ScannerResponseModel(BaseModel):
     url: str
     description: str
     table_id: str
+    scrape_mode: ScrapeMode = "auto"
     scanner_id: str
 
 
 router = APIRouter()
 
-# Ensure the `scanner_id` field in the collection is unique
-db.chartlink_scanners.create_index("scanner_id", unique=True)
-
 
 def generate_scanner_id():
     """Generate a unique scanner_id."""
@@ -33,7 +35,8 @@ async def add_scanner(item: ScannerItem):
         scanner_data["scanner_id"] = generate_scanner_id()
 
         # Insert the scanner into the collection
-        db.chartlink_scanners.insert_one(scanner_data)
+        await db.chartlink_scanners.insert_one(scanner_data)
+        await versions.bump(versions.SCANNERS)
 
         # Return the inserted item with scanner_id
         return scanner_data
@@ -45,12 +48,18 @@ async def add_scanner(item: ScannerItem):
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 
+async def scanners_validator(request: Request) -> Validator:
+    return await conditional_get(request, versions.SCANNERS)
+
+
 @router.get("/get_scanners", response_model=list[ScannerResponseModel])
-async def get_scanners():
+async def get_scanners(validator: Validator = Depends(scanners_validator)):
     """Fetch all scanners from the `chartlink_scanners` collection."""
     try:
-        scanners = list(db.chartlink_scanners.find({}, {"_id": 0}))
-        return scanners
+        scanners = await db.chartlink_scanners.find({}, {"_id": 0}).to_list(None)
+        return validator.respond(
+            [ScannerResponseModel(**scanner).dict() for scanner in scanners]
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
@@ -59,10 +68,16 @@ async def get_scanners():
 async def delete_scanner(scanner_id: str):
     """Delete a scanner by scanner_id from the `chartlink_scanners` collection."""
     try:
-        result = db.chartlink_scanners.delete_one({"scanner_id": scanner_id})
+        result = await db.chartlink_scanners.delete_one({"scanner_id": scanner_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Scanner not found.")
+        await versions.bump(versions.SCANNERS)
+        # Stop serving its stored results and drop it from stream clients
+        await scan_history.forget_scanner(scanner_id)
+        await live_feed.reload_scanner()
         return {"message": "Scanner deleted successfully."}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
@@ -71,13 +86,61 @@ async def delete_scanner(scanner_id: str):
 async def update_scanner(scanner_id: str, item: ScannerItem):
     """Update a scanner by scanner_id in the `chartlink_scanners` collection."""
     try:
-        result = db.chartlink_scanners.update_one(
+        result = await db.chartlink_scanners.update_one(
             {"scanner_id": scanner_id}, {"$set": item.dict()}
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Scanner not found.")
+        await versions.bump(versions.SCANNERS)
         updated_item = item.dict()
         updated_item["scanner_id"] = scanner_id
         return updated_item
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
+@router.get("/job_runs")
+async def get_job_runs(job: str = "upper_circuit", limit: int = 20):
+    """Recent runs of a scheduled job from the `job_runs` collection."""
+    try:
+        return (
+            await db.job_runs.find({"job": job}, {"_id": 0})
+            .sort("started_at", -1)
+            .limit(min(limit, 100))
+            .to_list(None)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
+@router.get("/results/latest")
+async def get_latest_results():
+    """Latest stored results of every scanner, without scraping."""
+    try:
+        return await scan_history.latest_results()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+
+@router.get("/results/latest/{scanner_id}")
+async def get_latest_result(scanner_id: str):
+    """Latest stored result of one scanner, without scraping."""
+    try:
+        results = await scan_history.latest_results(scanner_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    if not results:
+        raise HTTPException(status_code=404, detail="No stored results for scanner.")
+    return results[0]
+
+
+@router.get("/results/history/{symbol}")
+async def get_symbol_history(symbol: str, days: int = Query(30, ge=1, le=365)):
+    """When a symbol entered, moved in and left each scanner over recent days."""
+    since = datetime.utcnow() - timedelta(days=days)
+    try:
+        return await scan_history.symbol_history(symbol.upper(), since)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
@@ -1,82 +1,267 @@
+import asyncio
+import json
+import re
+from urllib.parse import urljoin
 from fastapi import APIRouter, HTTPException
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import os
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+from app.models.scanner import ScrapeMode
+from app.services.browser_pool import browser_pool
+from app.utils.cache import TTLCache
 
 router = APIRouter()
 
+# Pooled keep-alive session for plain HTTP fetches, created on first use
+http_session = None
+
+# Recent results, and scrapes currently running, keyed by (url, table_id, mode)
+scrape_cache = TTLCache(maxsize=256, ttl=settings.SCRAPE_CACHE_TTL_SECONDS)
+_inflight: dict[tuple, asyncio.Future] = {}
+
 
 class ScrapingRequest(BaseModel):
     url: str
     table_id: str
+    scrape_mode: ScrapeMode = "auto"
 
 
-def scrape_table_to_json(url: str, table_id: str):
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.binary_location = "/usr/bin/chromium"
+def parse_table(html: str, table_id: str):
+    """Extract the table rows as dicts, or return None if the table is absent."""
+    from lxml import html as lxml_html
 
-    # Dynamically set the binary path
-    # CHROME_BINARY_LOCATIONS = ["/usr/bin/chromium", "/usr/bin/chromedriver"]
-    # chrome_binary = next(
-    #     (path for path in CHROME_BINARY_LOCATIONS if os.path.exists(path)), None
-    # )
+    doc = lxml_html.fromstring(html)
 
-    # if not chrome_binary:
-    #     raise Exception("Chromium binary not found in the expected locations.")
+    tables = doc.xpath("//table[@id=$table_id]", table_id=table_id)
+    if not tables:
+        return None
+    table = tables[0]
 
-    service = Service("/usr/bin/chromedriver")
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    headers = [th.text_content().strip() for th in table.xpath("./thead//th")]
 
-    try:
-        driver.get(url)
-        driver.implicitly_wait(10)
-
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        driver.quit()
-
-        table = soup.find("table", id=table_id)
-        if not table:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Table with ID '{table_id}' not found on the page.",
-            )
-
-        headers = []
-        header_row = table.find("thead").find_all("th")
-        for header in header_row:
-            headers.append(header.text.strip())
-
-        table_data = []
-        rows = table.find("tbody").find_all("tr")
-        for row in rows:
-            cells = row.find_all("td")
-            row_data = {}
-            for i, cell in enumerate(cells):
-                row_data[headers[i]] = cell.text.strip()
-            table_data.append(row_data)
+    table_data = []
+    for row in table.xpath("./tbody/tr"):
+        cells = row.xpath("./td")
+        table_data.append(
+            {headers[i]: cell.text_content().strip() for i, cell in enumerate(cells)}
+        )
+
+    return table_data
+
+
+def get_http_session():
+    global http_session
+    if http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=settings.SCRAPE_HTTP_POOL_SIZE,
+                pool_maxsize=settings.SCRAPE_HTTP_POOL_SIZE,
+            ),
+        )
+        session.headers.update(
+            {
+                "User-Agent": (
+                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                    "(KHTML, like Gecko) Chrome/131.0 Safari/537.36"
+                ),
+                "Accept": "text/html,application/xhtml+xml",
+            }
+        )
+        http_session = session
+    return http_session
+
+
+def fetch_page(url: str):
+    with upstream_timer("scrape_http", "get"):
+        response = get_http_session().get(url, timeout=settings.SCRAPE_HTTP_TIMEOUT)
+        response.raise_for_status()
+    return response
+
+
+# Chartink screener pages render an empty table and fill it from a JSON POST
+_SCAN_CLAUSE_PATTERN = re.compile(
+    r"""scan[_-]clause['"]?\s*[:=]\s*(['"])((?:\\.|(?!\1).)*)\1""", re.S
+)
+
+
+def extract_scan_clause(html: str) -> tuple[str, str] | None:
+    """Return (csrf token, scan clause) of a Chartink screener page, if present."""
+    from lxml import html as lxml_html
+
+    doc = lxml_html.fromstring(html)
+    tokens = doc.xpath("//meta[@name='csrf-token']/@content")
+    if not tokens:
+        return None
+
+    # A form field, a component attribute, or a value in an inline script
+    clause = None
+    fields = doc.xpath("//*[@name='scan_clause' or @id='scan_clause']")
+    if fields:
+        clause = fields[0].get("value") or fields[0].text_content()
+    if not clause:
+        attributes = doc.xpath(
+            "//@*[name()='scan-clause' or name()=':scan-clause' "
+            "or name()='data-scan-clause']"
+        )
+        clause = attributes[0] if attributes else None
+    if not clause:
+        match = _SCAN_CLAUSE_PATTERN.search(html)
+        if match:
+            try:
+                clause = json.loads(f'"{match.group(2)}"')
+            except ValueError:
+                clause = match.group(2)
+    if not clause or not clause.strip():
+        return None
+    return tokens[0], clause.strip().strip("'")
+
+
+def _chartink_row(position: int, item: dict) -> dict:
+    """One JSON result in the columns of the rendered results table.
+
+    The table's "Links" column is markup added by the page, not scan data.
+    """
+    per_chg = item.get("per_chg")
+    return {
+        "Sr.": str(item.get("sr", position)),
+        "Stock Name": item.get("name") or "",
+        "Symbol": item.get("nsecode") or "",
+        "% Chg": f"{float(per_chg):.2f}%" if per_chg is not None else "",
+        "Price": "" if item.get("close") is None else str(item["close"]),
+        "Volume": "" if item.get("volume") is None else str(item["volume"]),
+    }
+
+
+def fetch_chartink_rows(url: str, page) -> list[dict] | None:
+    """Run a Chartink scan through its JSON endpoint, or None if `page` isn't one."""
+    found = extract_scan_clause(page.text)
+    if found is None:
+        return None
+    csrf_token, clause = found
 
+    with upstream_timer("scrape_http", "process"):
+        response = get_http_session().post(
+            urljoin(url, "/screener/process"),
+            data={"scan_clause": clause},
+            headers={
+                "X-CSRF-TOKEN": csrf_token,
+                "X-Requested-With": "XMLHttpRequest",
+                "Accept": "application/json",
+                "Referer": url,
+            },
+            # The token belongs to this page's session, not whichever session
+            # another thread's fetch left in the shared cookie jar
+            cookies=page.cookies,
+            timeout=settings.SCRAPE_HTTP_TIMEOUT,
+        )
+        response.raise_for_status()
+    return [
+        _chartink_row(i, item) for i, item in enumerate(response.json()["data"], 1)
+    ]
+
+
+def scrape_http(url: str, table_id: str) -> list[dict] | None:
+    """Table rows from server-rendered HTML or a Chartink JSON scan, else None.
+
+    An absent or empty table is None, since client-rendered tables are empty
+    in the HTML and need the browser; a Chartink scan may return no rows.
+    """
+    page = fetch_page(url)
+    table_data = parse_table(page.text, table_id)
+    if table_data:
         return table_data
+    return fetch_chartink_rows(url, page)
+
+
+def table_not_found(table_id: str):
+    return HTTPException(
+        status_code=404,
+        detail=f"Table with ID '{table_id}' not found on the page.",
+    )
 
+
+async def _scrape(url: str, table_id: str, mode: str):
+    if mode in ("auto", "http"):
+        try:
+            table_data = await run_in_threadpool(scrape_http, url, table_id)
+            if table_data is not None:
+                return table_data
+        except Exception as e:
+            if mode == "http":
+                raise HTTPException(
+                    status_code=502, detail=f"HTTP fetch failed: {str(e)}"
+                )
+            print(f"HTTP fetch failed for {url}, falling back to browser: {e}")
+
+        if mode == "http":
+            raise table_not_found(table_id)
+
+    try:
+        # Load the page in a warm pooled browser, off the event loop
+        html = await browser_pool.fetch_page_source(url, table_id)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503, detail="All browsers are busy, try again later."
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-    finally:
-        driver.quit()
+
+    table_data = await run_in_threadpool(parse_table, html, table_id)
+    if table_data is None:
+        raise table_not_found(table_id)
+    return table_data
+
+
+async def scrape_table_to_json(url: str, table_id: str, mode: str = "auto"):
+    key = (url, table_id, mode)
+    table_data = scrape_cache.get(key)
+    if table_data is not None:
+        return table_data
+
+    # Identical concurrent requests wait on the scrape already in flight
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(_scrape(url, table_id, mode))
+        _inflight[key] = future
+        try:
+            table_data = await asyncio.shield(future)
+            scrape_cache.set(key, table_data)
+            return table_data
+        finally:
+            _inflight.pop(key, None)
+
+    return await asyncio.shield(future)
+
+
+def close_scrapers():
+    """Release browsers and pooled HTTP connections on shutdown."""
+    browser_pool.close()
+    if http_session is not None:
+        http_session.close()
 
 
 @router.post("/table")
 async def scrape_table(request: ScrapingRequest):
     try:
-        table_data = scrape_table_to_json(request.url, request.table_id)
+        table_data = await scrape_table_to_json(
+            request.url, request.table_id, request.scrape_mode
+        )
         return {"data": table_data}
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to scrape table data: {str(e)}"
         )
+
+
+@router.get("/pool-stats")
+async def get_pool_stats():
+    """Expose browser pool and scrape cache usage for tuning."""
+    return {"browser_pool": browser_pool.stats(), "scrape_cache": scrape_cache.stats()}
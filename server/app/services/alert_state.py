@@ -0,0 +1,60 @@
+from datetime import datetime
+import pytz
+from pymongo import UpdateOne
+from app.db import db
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+def current_trading_day() -> str:
+    return datetime.now(pytz.utc).astimezone(IST).strftime("%Y-%m-%d")
+
+
+class AlertStateStore:
+    """Last alerted % change per symbol, loaded once per run and written on delivery."""
+
+    def __init__(self):
+        self.trading_day = None
+        self._state = {}
+
+    async def load(self):
+        """Load today's state in one query and drop entries from earlier days."""
+        self.trading_day = current_trading_day()
+        docs = await db.alert_state.find(
+            {"trading_day": self.trading_day}, {"_id": 0, "symbol": 1, "percent": 1}
+        ).to_list(None)
+        self._state = {doc["symbol"]: doc["percent"] for doc in docs}
+        await db.alert_state.delete_many({"trading_day": {"$ne": self.trading_day}})
+
+    def should_alert(self, symbol: str, percent_change: float) -> bool:
+        """Alert on first sight of a symbol, then on every further 1% gain."""
+        previous_percent = self._state.get(symbol)
+        return previous_percent is None or percent_change >= previous_percent + 1
+
+    async def record(self, alerted: dict[str, float]):
+        """Persist the % change each symbol was alerted at, in one bulk write.
+
+        Called once the alert email is delivered, so a failed send alerts again.
+        """
+        if not alerted:
+            return
+        self._state.update(alerted)
+
+        now = datetime.utcnow()
+        await db.alert_state.bulk_write(
+            [
+                UpdateOne(
+                    {"symbol": symbol},
+                    {
+                        "$set": {
+                            "percent": percent,
+                            "trading_day": self.trading_day,
+                            "updated_at": now,
+                        }
+                    },
+                    upsert=True,
+                )
+                for symbol, percent in alerted.items()
+            ],
+            ordered=False,
+        )
@@ -0,0 +1,176 @@
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+
+
+class BrowserSession:
+    """A long-lived headless Chromium whose single tab is reused across pages."""
+
+    def __init__(self):
+        # Selenium is only imported once a browser is actually needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.binary_location = settings.CHROME_BIN
+
+        service = Service(settings.CHROMEDRIVER_PATH)
+        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        # Bounds driver.get, which otherwise waits on a hung page forever
+        self.driver.set_page_load_timeout(settings.BROWSER_PAGE_LOAD_TIMEOUT)
+        self.pages = 0
+
+    def load(self, url: str, table_id: str, timeout: float) -> str:
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.pages += 1
+        try:
+            self.driver.get(url)
+        except TimeoutException:
+            # Keep what has loaded so far; the table may already be there
+            self.driver.execute_script("window.stop();")
+        try:
+            # Wait for the table to be rendered by the page's scripts
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((By.ID, table_id))
+            )
+        except TimeoutException:
+            pass
+        return self.driver.page_source
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Failed to quit browser: {e}")
+
+
+class BrowserPool:
+    """Bounded pool of warm browser sessions driven from worker threads."""
+
+    def __init__(self, size: int, max_pages: int, queue_timeout: float):
+        self.size = size
+        self.max_pages = max_pages
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="browser"
+        )
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[BrowserSession] = []
+        # Sessions in use by worker threads, quit on close
+        self._checked_out: set[BrowserSession] = set()
+        self._closed = False
+        self.waiting = 0
+        self.launched = 0
+        self.recycled = 0
+
+    def _load(self, session: BrowserSession | None, url: str, table_id: str):
+        """Runs in a worker thread: load the page, replacing crashed browsers."""
+        from selenium.common.exceptions import WebDriverException
+
+        for attempt in range(2):
+            if session is None:
+                with upstream_timer("selenium", "launch"):
+                    session = BrowserSession()
+                self.launched += 1
+            self._checked_out.add(session)
+            try:
+                with upstream_timer("selenium", "page_load"):
+                    html = session.load(url, table_id, settings.BROWSER_PAGE_TIMEOUT)
+            except Exception as e:
+                self._checked_out.discard(session)
+                session.quit()
+                session = None
+                self.recycled += 1
+                # Retry once on a fresh browser if the old one crashed
+                if attempt or self._closed or not isinstance(e, WebDriverException):
+                    raise
+                continue
+
+            if session.pages >= self.max_pages:
+                self._checked_out.discard(session)
+                session.quit()
+                session = None
+                self.recycled += 1
+            return session, html
+
+    async def fetch_page_source(self, url: str, table_id: str) -> str:
+        """Load `url` in a pooled browser without blocking the event loop."""
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        finally:
+            self.waiting -= 1
+
+        session = self._idle.pop() if self._idle else None
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(self._load, session, url, table_id)
+        except Exception:
+            self._checkin(session)
+            self._slots.release()
+            raise
+        # The session and slot are handed back when the load ends, even if
+        # this request was cancelled while waiting on it
+        future.add_done_callback(partial(self._finish_load, loop, session))
+        _, html = await asyncio.wrap_future(future)
+        return html
+
+    def _finish_load(self, loop, session: BrowserSession | None, future):
+        """Executor callback: pool the browser again and free the slot."""
+        if future.cancelled():
+            # Never started, so the checked-out session was not used
+            self._checkin(session)
+        elif future.exception() is None:
+            self._checkin(future.result()[0])
+        # Otherwise _load has already quit the browser
+        try:
+            loop.call_soon_threadsafe(self._slots.release)
+        except RuntimeError:
+            # The event loop is already closed
+            pass
+
+    def _checkin(self, session: BrowserSession | None):
+        if session is None:
+            return
+        self._checked_out.discard(session)
+        if self._closed:
+            session.quit()
+        else:
+            self._idle.append(session)
+
+    def close(self):
+        """Quit all browsers and stop the worker threads."""
+        self._closed = True
+        while self._idle:
+            self._idle.pop().quit()
+        # Loads in progress then fail and quit their browser
+        for session in list(self._checked_out):
+            session.quit()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "waiting": self.waiting,
+            "launched": self.launched,
+            "recycled": self.recycled,
+        }
+
+
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_pages=settings.BROWSER_MAX_PAGES,
+    queue_timeout=settings.BROWSER_QUEUE_TIMEOUT,
+)
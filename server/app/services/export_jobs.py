@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from bson import Binary
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.db import db
+from app.services import versions
+
+# Job fields not returned to clients; `content` is only read for downloads
+HIDDEN_FIELDS = ("content", "params")
+
+# Renders running in this process, referenced until they finish
+_running = set()
+
+
+def job_id(kind: str, user_id: str, params: dict, version: int) -> str:
+    """Same request against the same data version gives the same job."""
+    raw = repr((kind, user_id, sorted(params.items()), version)).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _projection() -> dict:
+    return {field: 0 for field in HIDDEN_FIELDS}
+
+
+def _public(job: dict) -> dict:
+    job = {k: v for k, v in job.items() if k not in HIDDEN_FIELDS}
+    job["job_id"] = job.pop("_id")
+    return job
+
+
+async def submit(kind: str, user_id: str, resource: str, params: dict, build) -> dict:
+    """Start `build()` for the current version of `resource`, or reuse its job.
+
+    `build` is a coroutine function returning (filename, media_type, content).
+    """
+    version, _ = await versions.current(resource)
+    now = datetime.utcnow()
+    job = {
+        "_id": job_id(kind, user_id, params, version),
+        "user_id": user_id,
+        "kind": kind,
+        "params": params,
+        "version": version,
+        "status": "pending",
+        "created_at": now,
+        # A render lost with its process is retried once this passes
+        "expires_at": now + timedelta(seconds=settings.EXPORT_RENDER_TIMEOUT_SECONDS),
+    }
+    try:
+        await db.export_jobs.insert_one(job)
+    except DuplicateKeyError:
+        existing = await db.export_jobs.find_one({"_id": job["_id"]}, _projection())
+        if existing is not None and existing["status"] != "failed":
+            return _public(existing)
+        await db.export_jobs.replace_one({"_id": job["_id"]}, job, upsert=True)
+
+    task = asyncio.create_task(_run(job["_id"], build))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return _public(job)
+
+
+async def _run(job_id: str, build):
+    try:
+        filename, media_type, content = await asyncio.wait_for(
+            build(), settings.EXPORT_RENDER_TIMEOUT_SECONDS
+        )
+        update = {
+            "status": "done",
+            "filename": filename,
+            "media_type": media_type,
+            "size": len(content),
+            "content": Binary(content),
+            # Kept until the data changes (new job id) or the TTL index drops it
+            "expires_at": datetime.utcnow()
+            + timedelta(seconds=settings.EXPORT_CACHE_TTL_SECONDS),
+        }
+    except Exception as e:
+        print(f"Export job {job_id} failed: {e}")
+        update = {
+            "status": "failed",
+            "error": str(e) or type(e).__name__,
+            "expires_at": datetime.utcnow() + timedelta(minutes=1),
+        }
+    update["finished_at"] = datetime.utcnow()
+
+    try:
+        await db.export_jobs.update_one({"_id": job_id}, {"$set": update})
+    except Exception as e:
+        print(f"Failed to store export job {job_id}: {e}")
+
+
+async def get(job_id: str, user_id: str) -> dict | None:
+    job = await db.export_jobs.find_one(
+        {"_id": job_id, "user_id": user_id}, _projection()
+    )
+    return None if job is None else _public(job)
+
+
+async def download(job_id: str, user_id: str) -> dict | None:
+    """The finished job with its rendered content, if it belongs to `user_id`."""
+    return await db.export_jobs.find_one(
+        {"_id": job_id, "user_id": user_id, "status": "done"},
+        {"filename": 1, "media_type": 1, "content": 1},
+    )
+
+
+async def close():
+    """Cancel renders still running in this process."""
+    for task in list(_running):
+        task.cancel()
+    await asyncio.gather(*_running, return_exceptions=True)
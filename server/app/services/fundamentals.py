@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+from app.db import db
+from app.utils.cache import TTLCache
+
+# Fields kept from Ticker.info; they change at most daily
+INFO_FIELDS = (
+    "longName",
+    "marketCap",
+    "sector",
+    "industry",
+    "trailingPE",
+    "fiftyTwoWeekLow",
+    "fiftyTwoWeekHigh",
+    "previousClose",
+    "currentPrice",
+    "open",
+    "volume",
+)
+
+# In-memory hot tier in front of the `fundamentals` collection
+fundamentals_cache = TTLCache(
+    maxsize=settings.FUNDAMENTALS_CACHE_SIZE, ttl=settings.FUNDAMENTALS_HOT_TTL_SECONDS
+)
+
+# Bounds concurrent Ticker.info calls across all requests and the refresh job
+_fetch_slots = asyncio.Semaphore(settings.FUNDAMENTALS_CONCURRENCY)
+
+
+def _fetch_info(symbol: str) -> dict:
+    # yfinance is imported on first use to keep startup fast
+    import yfinance as yf
+
+    with upstream_timer("yfinance", "info"):
+        info = yf.Ticker(symbol).info
+    return {field: info.get(field) for field in INFO_FIELDS}
+
+
+async def _fetch_all(symbols: list[str]) -> tuple[dict, dict]:
+    """Fetch info for `symbols` with bounded parallelism and persist the results."""
+
+    async def fetch(symbol: str):
+        async with _fetch_slots:
+            return await asyncio.to_thread(_fetch_info, symbol)
+
+    results = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+
+    infos = {}
+    errors = {}
+    now = datetime.utcnow()
+    updates = []
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            errors[symbol] = str(result)
+            continue
+        infos[symbol] = result
+        fundamentals_cache.set(symbol, result)
+        updates.append(
+            UpdateOne(
+                {"symbol": symbol},
+                {"$set": {"info": result, "refreshed_at": now}},
+                upsert=True,
+            )
+        )
+    if updates:
+        try:
+            await db.fundamentals.bulk_write(updates, ordered=False)
+        except Exception as e:
+            print(f"Failed to store fundamentals: {e}")
+    return infos, errors
+
+
+async def get_infos(symbols: list[str]) -> tuple[dict, dict]:
+    """Return ({symbol: info}, {symbol: error}) from memory, then Mongo, then Yahoo."""
+    symbols = list(dict.fromkeys(symbols))
+    infos = {}
+    for symbol in symbols:
+        info = fundamentals_cache.get(symbol)
+        if info is not None:
+            infos[symbol] = info
+
+    missing = [s for s in symbols if s not in infos]
+    if missing:
+        fresh_after = datetime.utcnow() - timedelta(
+            hours=settings.FUNDAMENTALS_MAX_AGE_HOURS
+        )
+        try:
+            async for doc in db.fundamentals.find(
+                {"symbol": {"$in": missing}, "refreshed_at": {"$gte": fresh_after}},
+                {"_id": 0, "symbol": 1, "info": 1},
+            ):
+                infos[doc["symbol"]] = doc["info"]
+                fundamentals_cache.set(doc["symbol"], doc["info"])
+        except Exception as e:
+            print(f"Failed to read stored fundamentals: {e}")
+
+    fetched, errors = await _fetch_all([s for s in symbols if s not in infos])
+    infos.update(fetched)
+    return infos, errors
+
+
+async def refresh_all() -> dict:
+    """Re-fetch every stored symbol; run daily by the scheduler."""
+    symbols = await db.fundamentals.distinct("symbol")
+    infos, errors = await _fetch_all(symbols)
+    return {
+        "rows": len(infos),
+        "errors": [f"{symbol}: {error}" for symbol, error in errors.items()],
+    }
@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+
+# One raw little-endian file per column, i.e. six files per symbol and
+# interval under <root>/<interval>/<symbol>/; timestamps are epoch seconds (UTC)
+COLUMNS = {
+    "timestamp": "<i8",
+    "open": "<f8",
+    "high": "<f8",
+    "low": "<f8",
+    "close": "<f8",
+    "volume": "<f8",
+}
+
+INTERVALS = {
+    "1d": timedelta(days=1),
+    "1h": timedelta(hours=1),
+}
+
+# How much history the first sync of a symbol downloads
+BACKFILL_PERIODS = {
+    "1d": "5y",
+    "1h": "730d",
+}
+
+
+def _epoch(value: datetime) -> int:
+    # Naive datetimes from query strings are taken as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class HistoryStore:
+    """Append-only columnar OHLCV files per symbol, read back through mmap."""
+
+    def __init__(self, root: str, refresh_seconds: float):
+        self.root = root
+        self.refresh_seconds = refresh_seconds
+        self._locks: dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._last_sync: dict[tuple, float] = {}
+        self.network_fetches = 0
+
+    def _dir(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, quote(symbol, safe=""))
+
+    def _lock(self, key: tuple) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def read(self, symbol: str, interval: str) -> dict:
+        """Map every column read-only; all columns are cut to the same length."""
+        import numpy as np
+
+        path = self._dir(symbol, interval)
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            file = os.path.join(path, f"{name}.bin")
+            if not os.path.exists(file) or os.path.getsize(file) == 0:
+                return {}
+            columns[name] = np.memmap(file, dtype=dtype, mode="r")
+
+        # A crash between column appends leaves some columns one batch longer
+        rows = min(len(column) for column in columns.values())
+        return {name: column[:rows] for name, column in columns.items()}
+
+    def append(self, symbol: str, interval: str, frame) -> int:
+        """Append bars newer than the last stored timestamp; returns rows written."""
+        import numpy as np
+
+        if frame.empty:
+            return 0
+
+        timestamps = (frame.index.tz_convert("UTC").asi8 // 10**9).astype("<i8")
+        existing = self.read(symbol, interval)
+        rows = len(existing["timestamp"]) if existing else 0
+        if existing:
+            newer = timestamps > existing["timestamp"][-1]
+            frame, timestamps = frame[newer], timestamps[newer]
+            if frame.empty:
+                return 0
+
+        path = self._dir(symbol, interval)
+        os.makedirs(path, exist_ok=True)
+        values = {
+            "timestamp": timestamps,
+            "open": frame["Open"].to_numpy(),
+            "high": frame["High"].to_numpy(),
+            "low": frame["Low"].to_numpy(),
+            "close": frame["Close"].to_numpy(),
+            "volume": frame["Volume"].to_numpy(),
+        }
+        for name, dtype in COLUMNS.items():
+            with open(os.path.join(path, f"{name}.bin"), "ab") as f:
+                # Cut the tail an interrupted append left on some columns, so
+                # every column continues from the same row
+                f.truncate(rows * np.dtype(dtype).itemsize)
+                f.write(np.ascontiguousarray(values[name], dtype=dtype).tobytes())
+        return len(frame)
+
+    def _download(self, symbol: str, interval: str, start: datetime | None):
+        import yfinance as yf
+
+        self.network_fetches += 1
+        ticker = yf.Ticker(symbol)
+        # Unadjusted prices, so stored bars stay valid after splits and dividends
+        with upstream_timer("yfinance", "history"):
+            if start is None:
+                frame = ticker.history(
+                    period=BACKFILL_PERIODS[interval],
+                    interval=interval,
+                    auto_adjust=False,
+                )
+            else:
+                frame = ticker.history(
+                    start=start, interval=interval, auto_adjust=False
+                )
+
+        # Only store completed bars; the current one is still changing
+        if not frame.empty:
+            cutoff = datetime.now(timezone.utc) - INTERVALS[interval]
+            frame = frame[frame.index.tz_convert("UTC") <= cutoff]
+        return frame.dropna(subset=["Close"])
+
+    def sync(self, symbol: str, interval: str = "1d") -> int:
+        """Fetch only the bars missing since the last sync; no-op while fresh."""
+        key = (symbol, interval)
+        with self._lock(key):
+            last_sync = self._last_sync.get(key)
+            if last_sync is not None and time.monotonic() - last_sync < (
+                self.refresh_seconds
+            ):
+                return 0
+
+            existing = self.read(symbol, interval)
+            start = None
+            if existing:
+                last = datetime.fromtimestamp(
+                    int(existing["timestamp"][-1]), tz=timezone.utc
+                )
+                # The next bar cannot be complete yet
+                if datetime.now(timezone.utc) - last < 2 * INTERVALS[interval]:
+                    self._last_sync[key] = time.monotonic()
+                    return 0
+                start = last + INTERVALS[interval]
+
+            frame = self._download(symbol, interval, start)
+            written = self.append(symbol, interval, frame)
+            self._last_sync[key] = time.monotonic()
+            return written
+
+    def range(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> dict:
+        """Return zero-copy column views for bars in [start, end)."""
+        import numpy as np
+
+        columns = self.read(symbol, interval)
+        if not columns:
+            return {}
+
+        timestamps = columns["timestamp"]
+        lo = 0 if start is None else np.searchsorted(timestamps, _epoch(start))
+        hi = len(timestamps) if end is None else np.searchsorted(timestamps, _epoch(end))
+        return {name: column[lo:hi] for name, column in columns.items()}
+
+
+history_store = HistoryStore(
+    root=settings.HISTORY_STORE_DIR,
+    refresh_seconds=settings.HISTORY_REFRESH_SECONDS,
+)
@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.db import db
+
+# Fields returned to clients; ledger documents also carry user_id and _id
+TRANSACTION_FIELDS = {"type": 1, "amount": 1, "date": 1, "description": 1}
+
+
+def encode_cursor(transaction: dict) -> str:
+    raw = json.dumps([transaction["date"].isoformat(), str(transaction["_id"])])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    date, _id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return datetime.fromisoformat(date), ObjectId(_id)
+
+
+def build_query(
+    user_id: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    cursor: str | None = None,
+) -> dict:
+    """Filter a user's ledger by date range, continuing after `cursor`."""
+    query = {"user_id": user_id}
+
+    date_range = {}
+    if start is not None:
+        date_range["$gte"] = start
+    if end is not None:
+        date_range["$lt"] = end
+    if date_range:
+        query["date"] = date_range
+
+    if cursor is not None:
+        # Newest first: continue strictly after the last (date, _id) returned
+        date, _id = decode_cursor(cursor)
+        query["$or"] = [
+            {"date": {"$lt": date}},
+            {"date": date, "_id": {"$lt": _id}},
+        ]
+    return query
+
+
+def find_transactions(query: dict, limit: int = 0, batch_size: int = 500):
+    return (
+        db.transactions.find(query, {**TRANSACTION_FIELDS, "_id": 1})
+        .sort([("date", -1), ("_id", -1)])
+        .limit(limit)
+        .batch_size(batch_size)
+    )
+
+
+async def get_page(query: dict, limit: int) -> tuple[list[dict], str | None]:
+    """Return up to `limit` transactions and the cursor for the next page."""
+    transactions = await find_transactions(query, limit=limit + 1).to_list(None)
+
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = encode_cursor(transactions[-1])
+
+    for transaction in transactions:
+        del transaction["_id"]
+    return transactions, next_cursor
+
+
+async def iter_transactions(query: dict):
+    """Yield matching transactions one at a time from the server-side cursor."""
+    async for transaction in find_transactions(query):
+        del transaction["_id"]
+        yield transaction
+
+
+# Entries are written before the balance moves, tagged with a `pending` id
+# that is cleared once their amount is applied. The account keeps its most
+# recently applied ids, so applying the same id twice is a no-op.
+APPLIED_IDS_KEPT = 100
+
+
+def signed_amount(transaction: dict) -> float:
+    amount = transaction["amount"]
+    return amount if transaction["type"] == "deposit" else -amount
+
+
+async def settle(user_id: str, pending: ObjectId) -> dict | None:
+    """Apply the entries written under `pending` to the balance exactly once."""
+    delta = 0.0
+    async for transaction in db.transactions.find(
+        {"user_id": user_id, "pending": pending}, {"type": 1, "amount": 1}
+    ):
+        delta += signed_amount(transaction)
+
+    account = await db.bank_accounts.find_one_and_update(
+        {"user_id": user_id, "applied_ids": {"$ne": pending}},
+        {
+            "$inc": {"account_balance": delta},
+            "$push": {"applied_ids": {"$each": [pending], "$slice": -APPLIED_IDS_KEPT}},
+        },
+        projection={"account_balance": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    await db.transactions.update_many(
+        {"user_id": user_id, "pending": pending}, {"$unset": {"pending": ""}}
+    )
+    if account is None:
+        # Already applied by an earlier attempt
+        account = await db.bank_accounts.find_one(
+            {"user_id": user_id}, {"account_balance": 1}
+        )
+    return account
+
+
+async def settle_stale(user_id: str):
+    """Apply entries left pending by a write that failed part-way."""
+    # Younger ids may belong to a write that is still in progress
+    cutoff = ObjectId.from_datetime(
+        datetime.utcnow() - timedelta(seconds=settings.LEDGER_PENDING_GRACE_SECONDS)
+    )
+    stale = await db.transactions.distinct(
+        "pending", {"user_id": user_id, "pending": {"$lt": cutoff}}
+    )
+    for pending in stale:
+        await settle(user_id, pending)
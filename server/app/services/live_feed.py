@@ -0,0 +1,130 @@
+import asyncio
+from app.core.config import settings
+from app.models.market import to_market_summary
+from app.services import scan_history, scan_service
+from app.services.stock_service import fetch_quotes
+
+# Indices pushed on the market channel, keyed as in /market/market-summary
+MARKET_INDICES = {"nifty_50": "^NSEI", "sensex": "^BSESN"}
+
+
+def diff_state(old: dict, new: dict) -> dict | None:
+    """Entries that changed or appeared, and keys that disappeared."""
+    changed = {key: value for key, value in new.items() if old.get(key) != value}
+    removed = [key for key in old if key not in new]
+    if not changed and not removed:
+        return None
+    return {"changed": changed, "removed": removed}
+
+
+class LiveFeed:
+    """Single upstream producer whose updates fan out to subscribers as deltas."""
+
+    def __init__(self, market_interval: float, scanner_interval: float, queue_size: int):
+        self.intervals = {"market": market_interval, "scanner": scanner_interval}
+        self.queue_size = queue_size
+        self.state = {"market": {}, "scanner": {}}
+        self.version = 0
+        self._subscribers: set[asyncio.Queue] = set()
+        self._producers: dict[str, asyncio.Task] = {}
+        self.refreshes = {"market": 0, "scanner": 0}
+        self.resyncs = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client; its queue starts with a full snapshot."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        queue.put_nowait(self._snapshot())
+        self._subscribers.add(queue)
+
+        # Producers only run while someone is listening
+        for channel, refresh in (
+            ("market", self._refresh_market),
+            ("scanner", self._refresh_scanner),
+        ):
+            task = self._producers.get(channel)
+            if task is None or task.done():
+                self._producers[channel] = asyncio.create_task(
+                    self._produce(channel, refresh)
+                )
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _snapshot(self) -> tuple[str, dict]:
+        return "snapshot", {"version": self.version, **self.state}
+
+    def publish(self, channel: str, values: dict):
+        """Replace one channel's state and push only the delta to subscribers."""
+        delta = diff_state(self.state[channel], values)
+        if delta is None:
+            return
+        self.state[channel] = values
+        self.version += 1
+        event = (channel, {"version": self.version, **delta})
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow client has missed deltas; restart it from a snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._snapshot())
+                self.resyncs += 1
+
+    def publish_scanner(self, stocks: list[dict]):
+        self.publish("scanner", {stock["Symbol"]: stock for stock in stocks})
+
+    async def _refresh_market(self):
+        quotes = await asyncio.to_thread(fetch_quotes, list(MARKET_INDICES.values()))
+        self.publish(
+            "market",
+            {
+                name: to_market_summary(quotes[symbol]).model_dump()
+                for name, symbol in MARKET_INDICES.items()
+                if symbol in quotes
+            },
+        )
+
+    async def _refresh_scanner(self):
+        # Read the scheduled job's stored results; streaming never scrapes,
+        # and workers that did not run the job still see its results
+        latest = await scan_history.latest_results()
+        self.publish_scanner(
+            scan_service.dedupe_stocks([doc for doc in latest if "rows" in doc])
+        )
+
+    async def reload_scanner(self):
+        """Republish stored scanner results now, e.g. after a scanner is deleted."""
+        if self._subscribers:
+            await self._refresh_scanner()
+
+    async def _produce(self, channel: str, refresh):
+        while self._subscribers:
+            try:
+                await refresh()
+                self.refreshes[channel] += 1
+            except Exception as e:
+                print(f"Failed to refresh {channel} feed: {e}")
+            await asyncio.sleep(self.intervals[channel])
+
+    def close(self):
+        for task in self._producers.values():
+            task.cancel()
+        self._producers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "version": self.version,
+            "refreshes": dict(self.refreshes),
+            "resyncs": self.resyncs,
+        }
+
+
+live_feed = LiveFeed(
+    market_interval=settings.STREAM_MARKET_INTERVAL,
+    scanner_interval=settings.STREAM_SCANNER_INTERVAL,
+    queue_size=settings.STREAM_QUEUE_SIZE,
+)
@@ -0,0 +1,240 @@
+import asyncio
+from datetime import datetime
+import pytz
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+
+EMAIL_STYLES = """
+                body {
+                    font-family: Arial, sans-serif;
+                    background-color: #f9f9f9;
+                    margin: 20px;
+                    color: #333;
+                }
+                .container {
+                    background-color: #fff;
+                    padding: 20px;
+                    border: 1px solid #ddd;
+                    border-radius: 5px;
+                }
+                h2 {
+                    color: #0056b3;
+                    margin-top: 0;
+                }
+                table {
+                    width: 100%;
+                    border-collapse: collapse;
+                    margin: 20px 0;
+                }
+                th, td {
+                    border: 1px solid #ddd;
+                    padding: 10px;
+                    text-align: left;
+                }
+                th {
+                    background-color: #f4f4f4;
+                    color: #333;
+                }
+                .footer {
+                    margin-top: 20px;
+                    font-size: 0.9em;
+                    color: #555;
+                }
+"""
+
+EMAIL_FOOTER = """
+                <div class="footer">
+                    <p>This is an automated notification. Please verify the details before making any trading decisions.</p>
+                </div>
+"""
+
+STOCK_FIELDS = [
+    ("Stock Name", "Stock Name"),
+    ("Symbol", "Symbol"),
+    ("Price", "Price"),
+    ("% Change", "% Chg"),
+    ("Volume", "Volume"),
+]
+
+
+def _formatted_time() -> str:
+    utc_now = datetime.now(pytz.utc)
+    return utc_now.astimezone(pytz.timezone("Asia/Kolkata")).strftime(
+        "%d-%b %I:%M%p"
+    )
+
+
+def _html(title: str, intro: str, table: str) -> str:
+    return f"""
+    <!DOCTYPE html>
+    <html>
+        <head>
+            <style>{EMAIL_STYLES}</style>
+        </head>
+        <body>
+            <div class="container">
+                <h2>{title}</h2>
+                <p>{intro}</p>
+                <table>{table}
+                </table>{EMAIL_FOOTER}
+            </div>
+        </body>
+    </html>
+    """
+
+
+def build_stock_email(stock: dict) -> tuple[str, str]:
+    """Return (subject, html body) for a single stock alert."""
+    subject = f"🚨 Stock Alert at {_formatted_time()}: {stock.get('Symbol', '')} 🚨"
+    rows = "".join(
+        f"""
+                    <tr>
+                        <th>{label}</th>
+                        <td>{stock.get(key, '')}</td>
+                    </tr>"""
+        for label, key in STOCK_FIELDS
+    )
+    return subject, _html(
+        "Stock Alert", "The following stock has triggered your alert:", rows
+    )
+
+
+def build_digest_email(stocks: list[dict]) -> tuple[str, str]:
+    """Return (subject, html body) summarising every alert from one scan run."""
+    subject = f"🚨 Stock Alerts at {_formatted_time()}: {len(stocks)} stocks 🚨"
+    header = "".join(f"<th>{label}</th>" for label, _ in STOCK_FIELDS)
+    rows = f"""
+                    <tr>{header}</tr>""" + "".join(
+        f"""
+                    <tr>{''.join(f'<td>{stock.get(key, "")}</td>' for _, key in STOCK_FIELDS)}</tr>"""
+        for stock in stocks
+    )
+    return subject, _html(
+        "Stock Alerts", "The following stocks have triggered your alert:", rows
+    )
+
+
+class EmailDispatcher:
+    """Background sender that reuses one authenticated SMTP connection."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._smtp = None
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+    def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Send whatever is still queued, then close the connection."""
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        self._worker = None
+        await asyncio.to_thread(self._disconnect)
+
+    def notify(self, stock: dict, on_sent=None):
+        """Queue an alert; `on_sent` is awaited once it has been delivered."""
+        # User-registered scanners may not have every column
+        label = stock.get("Stock Name") or stock.get("Symbol", "")
+        self._enqueue(*build_stock_email(stock), label=label, on_sent=on_sent)
+
+    def notify_digest(self, stocks: list[dict], on_sent=None):
+        if stocks:
+            self._enqueue(
+                *build_digest_email(stocks),
+                label=f"{len(stocks)} stocks",
+                on_sent=on_sent,
+            )
+
+    def _enqueue(self, subject: str, body: str, label: str, on_sent=None):
+        if self._queue is None:
+            print(f"Email dispatcher not running, dropping alert for {label}")
+            return
+        self._queue.put_nowait((subject, body, label, on_sent))
+
+    async def _run(self):
+        while True:
+            subject, body, label, on_sent = await self._queue.get()
+            try:
+                sent = await self._send_with_retry(subject, body, label)
+                if sent and on_sent is not None:
+                    await on_sent()
+            except Exception as e:
+                print(f"Failed to record sent email for {label}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _send_with_retry(self, subject: str, body: str, label: str) -> bool:
+        for attempt in range(settings.EMAIL_MAX_RETRIES + 1):
+            try:
+                await asyncio.to_thread(self._send, subject, body)
+                self.sent += 1
+                print(f"Email sent for stock: {label}")
+                return True
+            except Exception as e:
+                # Drop the connection so the next attempt reconnects
+                await asyncio.to_thread(self._disconnect)
+                if attempt == settings.EMAIL_MAX_RETRIES:
+                    self.failed += 1
+                    print(f"Failed to send email: {e}")
+                    return False
+                self.retries += 1
+                await asyncio.sleep(settings.EMAIL_RETRY_BACKOFF * 2**attempt)
+
+    def _connect(self):
+        import smtplib
+
+        smtp = smtplib.SMTP(
+            settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT
+        )
+        if settings.SMTP_STARTTLS:
+            smtp.starttls()
+        if settings.EMAIL_PASSWORD:
+            smtp.login(settings.SENDER_EMAIL, settings.EMAIL_PASSWORD)
+        self._smtp = smtp
+
+    def _disconnect(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+    def _send(self, subject: str, body: str):
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        msg = MIMEMultipart()
+        msg["From"] = settings.SENDER_EMAIL
+        msg["To"] = settings.RECEIVER_EMAIL
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "html"))  # Attach HTML content
+
+        if self._smtp is None:
+            with upstream_timer("smtp", "connect"):
+                self._connect()
+        with upstream_timer("smtp", "send"):
+            self._smtp.sendmail(
+                settings.SENDER_EMAIL,
+                settings.RECEIVER_EMAIL.split(","),
+                msg.as_string(),
+            )
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
+
+
+email_dispatcher = EmailDispatcher()
@@ -0,0 +1,55 @@
+HOLDING_COLUMNS = [
+    "symbol",
+    "quantity",
+    "purchase_price",
+    "current_price",
+    "previous_close",
+    "cost_basis",
+    "market_value",
+    "unrealized_pnl",
+    "unrealized_pnl_pct",
+    "day_change",
+    "weight",
+]
+
+
+def value_holdings(holdings: list[dict], quotes: dict) -> dict:
+    """Price all holdings and compute P&L and weights in one vectorized pass."""
+    import numpy as np
+    import pandas as pd
+
+    if not holdings:
+        return {
+            "holdings": [],
+            "summary": {
+                "cost_basis": 0.0,
+                "market_value": 0.0,
+                "unrealized_pnl": 0.0,
+                "day_change": 0.0,
+            },
+        }
+
+    df = pd.DataFrame(holdings, columns=["symbol", "quantity", "purchase_price"])
+    # Float dtype even when no quotes came back, so missing prices are NaN
+    prices = pd.DataFrame.from_dict(
+        quotes, orient="index", columns=["current_price", "previous_close"]
+    ).astype(float)
+    df = df.join(prices, on="symbol")
+
+    df["cost_basis"] = df["quantity"] * df["purchase_price"]
+    df["market_value"] = df["quantity"] * df["current_price"]
+    df["unrealized_pnl"] = df["market_value"] - df["cost_basis"]
+    df["unrealized_pnl_pct"] = df["unrealized_pnl"] / df["cost_basis"] * 100
+    df["day_change"] = df["quantity"] * (df["current_price"] - df["previous_close"])
+    total_value = df["market_value"].sum()
+    df["weight"] = df["market_value"] / total_value * 100 if total_value else np.nan
+
+    df = df.replace([np.inf, -np.inf], np.nan).round(2)
+    summary = df[["cost_basis", "market_value", "unrealized_pnl", "day_change"]].sum()
+
+    # Holdings without a quote are returned with null valuation fields
+    records = df[HOLDING_COLUMNS].astype(object).where(df.notna(), None)
+    return {
+        "holdings": records.to_dict(orient="records"),
+        "summary": {key: round(float(value), 2) for key, value in summary.items()},
+    }
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+import pytz
+from pymongo import UpdateOne
+from app.db import db
+from app.services.alert_state import IST
+
+DIFF_KINDS = ("entered", "moved", "left")
+
+
+def rank_rows(rows: list[dict]) -> dict:
+    """Map each symbol to its 1-based position in the scanner table and its row."""
+    ranked = {}
+    for row in rows:
+        symbol = row.get("Symbol")
+        if symbol and symbol not in ranked:
+            ranked[symbol] = (len(ranked) + 1, row)
+    return ranked
+
+
+def diff_rows(previous: list[dict], current: list[dict]) -> dict:
+    """Symbols that entered, left, or changed rank between two runs.
+
+    Price, % Chg and Volume tick on every intraday run, so value-only changes
+    are not diffs; the current values are kept in `scan_latest.rows`.
+    """
+    before = rank_rows(previous)
+    after = rank_rows(current)
+    return {
+        "entered": [
+            {"symbol": symbol, "rank": rank, "row": row}
+            for symbol, (rank, row) in after.items()
+            if symbol not in before
+        ],
+        "moved": [
+            {
+                "symbol": symbol,
+                "rank": rank,
+                "previous_rank": before[symbol][0],
+                "row": row,
+            }
+            for symbol, (rank, row) in after.items()
+            if symbol in before and rank != before[symbol][0]
+        ],
+        "left": [
+            {"symbol": symbol, "previous_rank": rank}
+            for symbol, (rank, _) in before.items()
+            if symbol not in after
+        ],
+    }
+
+
+async def record_run(results: list[dict], ts: datetime):
+    """Store each successful scanner's diff against its previous run."""
+    succeeded = [r for r in results if r["status"] == "ok"]
+    if not succeeded:
+        return
+
+    latest = {
+        doc["scanner_id"]: doc.get("rows", [])
+        async for doc in db.scan_latest.find(
+            {"scanner_id": {"$in": [r["scanner_id"] for r in succeeded]}},
+            {"_id": 0, "scanner_id": 1, "rows": 1},
+        )
+    }
+
+    snapshots = []
+    updates = []
+    for result in succeeded:
+        diff = diff_rows(latest.get(result["scanner_id"], []), result["rows"])
+        # The latest rows are the base for the next run's diff
+        latest_update = {
+            "name": result["name"],
+            "checked_at": ts,
+            "rows": result["rows"],
+        }
+
+        # Runs without membership or rank changes store no snapshot
+        if any(diff.values()):
+            snapshots.append(
+                {
+                    "ts": ts,
+                    "scanner_id": result["scanner_id"],
+                    **diff,
+                    # Every symbol touched by this diff, for history lookups
+                    "symbols": sorted(
+                        {item["symbol"] for kind in DIFF_KINDS for item in diff[kind]}
+                    ),
+                    "total": len(result["rows"]),
+                }
+            )
+            latest_update["changed_at"] = ts
+
+        updates.append(
+            UpdateOne(
+                {"scanner_id": result["scanner_id"]},
+                {"$set": latest_update},
+                upsert=True,
+            )
+        )
+
+    if snapshots:
+        await db.scan_snapshots.insert_many(snapshots)
+    await db.scan_latest.bulk_write(updates, ordered=False)
+
+
+async def latest_results(scanner_id: str | None = None) -> list[dict]:
+    query = {} if scanner_id is None else {"scanner_id": scanner_id}
+    return await db.scan_latest.find(query, {"_id": 0}).to_list(None)
+
+
+async def forget_scanner(scanner_id: str):
+    """Drop a deleted scanner's latest results; its diff history is kept."""
+    await db.scan_latest.delete_one({"scanner_id": scanner_id})
+
+
+async def symbol_history(symbol: str, since: datetime) -> dict:
+    """Every diff event for a symbol since `since`, and when it was listed."""
+    events = []
+    async for doc in db.scan_snapshots.find(
+        {"symbols": symbol, "ts": {"$gte": since}}, {"_id": 0, "symbols": 0}
+    ).sort("ts", 1):
+        for kind in DIFF_KINDS:
+            for item in doc[kind]:
+                if item["symbol"] == symbol:
+                    events.append(
+                        {
+                            "ts": doc["ts"],
+                            "scanner_id": doc["scanner_id"],
+                            "event": kind,
+                            **item,
+                        }
+                    )
+
+    # Rebuild listing intervals per scanner from the entered/left events
+    intervals = []
+    open_since = {}
+    for event in events:
+        scanner_id = event["scanner_id"]
+        if event["event"] == "entered":
+            open_since[scanner_id] = event["ts"]
+        elif scanner_id not in open_since:
+            # Listed before the window started
+            open_since[scanner_id] = since
+        if event["event"] == "left":
+            intervals.append(
+                {
+                    "scanner_id": scanner_id,
+                    "from": open_since.pop(scanner_id),
+                    "to": event["ts"],
+                }
+            )
+
+    # Listed throughout the window without any change
+    async for doc in db.scan_latest.find(
+        {"rows.Symbol": symbol}, {"_id": 0, "scanner_id": 1}
+    ):
+        if not any(event["scanner_id"] == doc["scanner_id"] for event in events):
+            open_since[doc["scanner_id"]] = since
+
+    intervals += [
+        {"scanner_id": scanner_id, "from": start, "to": None}
+        for scanner_id, start in open_since.items()
+    ]
+
+    return {
+        "symbol": symbol,
+        "events": events,
+        "intervals": intervals,
+        "days": _listed_days(intervals),
+    }
+
+
+def _listed_days(intervals: list[dict]) -> list[str]:
+    """Dates (IST) on which the symbol was listed at some point."""
+    days = set()
+    now = datetime.utcnow()
+    for interval in intervals:
+        start = pytz.utc.localize(interval["from"]).astimezone(IST).date()
+        end = pytz.utc.localize(interval["to"] or now).astimezone(IST).date()
+        while start <= end:
+            days.add(start.isoformat())
+            start += timedelta(days=1)
+    return sorted(days)
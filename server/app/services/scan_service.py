@@ -0,0 +1,110 @@
+import asyncio
+import time
+from datetime import datetime
+from fastapi import HTTPException
+from app.core.config import settings
+from app.db import db
+from app.routes.scrape_table import scrape_table_to_json
+from app.services import scan_history
+
+# Scanned when no scanners have been registered yet
+DEFAULT_SCANNER = {
+    "scanner_id": "default",
+    "name": "BTST EMA RSI Volume",
+    "url": "https://chartink.com/screener/btst-ema-rsi-volume-2",
+    "table_id": "DataTables_Table_0",
+    "scrape_mode": "auto",
+}
+
+
+async def load_scanners() -> list[dict]:
+    scanners = await db.chartlink_scanners.find({}, {"_id": 0}).to_list(None)
+    return scanners or [DEFAULT_SCANNER]
+
+
+async def scan_one(scanner: dict, semaphore: asyncio.Semaphore) -> dict:
+    """Scrape one scanner and report its rows, duration and status."""
+    async with semaphore:
+        started = time.perf_counter()
+        result = {
+            "scanner_id": scanner["scanner_id"],
+            "name": scanner["name"],
+            "rows": [],
+            "status": "ok",
+            "error": None,
+        }
+        try:
+            result["rows"] = await scrape_table_to_json(
+                scanner["url"], scanner["table_id"], scanner.get("scrape_mode", "auto")
+            )
+        except HTTPException as e:
+            result["status"] = "failed"
+            result["error"] = e.detail
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+
+def dedupe_stocks(results: list[dict]) -> list[dict]:
+    """Merge rows from all scanners into one row per symbol."""
+    stocks = {}
+    for result in results:
+        for row in result["rows"]:
+            symbol = row.get("Symbol")
+            if not symbol:
+                continue
+            if symbol not in stocks:
+                stocks[symbol] = {**row, "scanners": []}
+            stocks[symbol]["scanners"].append(result["name"])
+    return list(stocks.values())
+
+
+async def scan_all() -> tuple[list[dict], list[dict]]:
+    """Scrape every registered scanner concurrently; returns (results, stocks)."""
+    scanners = await load_scanners()
+    semaphore = asyncio.Semaphore(settings.SCAN_CONCURRENCY)
+    results = await asyncio.gather(*(scan_one(s, semaphore) for s in scanners))
+    return results, dedupe_stocks(results)
+
+
+async def run_scanners() -> dict:
+    """Scrape every registered scanner concurrently and record the run."""
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+
+    results, stocks = await scan_all()
+
+    run = {
+        "started_at": started_at,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "symbols": len(stocks),
+        "scanners": [
+            {
+                "scanner_id": r["scanner_id"],
+                "name": r["name"],
+                "status": r["status"],
+                "error": r["error"],
+                "rows": len(r["rows"]),
+                "duration_ms": r["duration_ms"],
+            }
+            for r in results
+        ],
+    }
+    for r in run["scanners"]:
+        if r["status"] == "failed":
+            print(f"Scanner {r['name']} failed after {r['duration_ms']}ms: {r['error']}")
+
+    try:
+        await db.scan_runs.insert_one(dict(run))
+    except Exception as e:
+        print(f"Failed to record scan run: {e}")
+
+    try:
+        # Keep only what changed since each scanner's previous run
+        await scan_history.record_run(results, started_at)
+    except Exception as e:
+        print(f"Failed to record scan snapshots: {e}")
+
+    return {**run, "stocks": stocks}
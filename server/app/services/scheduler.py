@@ -0,0 +1,161 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from app.core.config import settings
+from app.db import db
+from app.utils.cron import next_fire_time
+
+
+class Scheduler:
+    """Cron jobs that run once per tick across every worker and replica.
+
+    Before running a tick, a process takes the job's lease in `job_locks`.
+    The lease is renewed while the job runs, so a run that overlaps the next
+    tick keeps it, and that tick is skipped everywhere. Each run the process
+    executes is recorded in `job_runs`.
+    """
+
+    def __init__(self, lease_seconds: float):
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._jobs: dict[str, tuple[str, callable]] = {}
+        self._loops: list[asyncio.Task] = []
+        self._running: dict[str, asyncio.Task] = {}
+
+    def job(self, name: str, *, cron: str):
+        """Register the decorated coroutine; it is returned unchanged."""
+
+        def decorator(func):
+            self._jobs[name] = (cron, func)
+            return func
+
+        return decorator
+
+    def start(self):
+        from croniter import croniter
+
+        for name, (cron, func) in self._jobs.items():
+            if not croniter.is_valid(cron or ""):
+                raise ValueError(f"Invalid cron expression for {name}: '{cron}'")
+            self._loops.append(asyncio.create_task(self._loop(name, cron, func)))
+
+    async def stop(self):
+        for task in self._loops + list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(
+            *self._loops, *self._running.values(), return_exceptions=True
+        )
+        self._loops.clear()
+        self._running.clear()
+
+    async def _loop(self, name: str, cron: str, func):
+        while True:
+            tick = next_fire_time(cron)
+            await asyncio.sleep(max(0.0, (tick - datetime.now()).total_seconds()))
+
+            running = self._running.get(name)
+            if running is not None and not running.done():
+                print(f"Skipping {name} at {tick}: previous run still in progress")
+                continue
+            self._running[name] = asyncio.create_task(self.run(name, func, tick))
+
+    async def acquire(self, name: str, tick_key: str) -> bool:
+        """Take the job's lease for this tick unless it is held or already ran."""
+        now = datetime.utcnow()
+        try:
+            await db.job_locks.update_one(
+                {"_id": name, "expires_at": {"$lte": now}, "tick": {"$ne": tick_key}},
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "tick": tick_key,
+                        "acquired_at": now,
+                        "expires_at": now + timedelta(seconds=self.lease_seconds),
+                    }
+                },
+                upsert=True,
+            )
+            return True
+        except DuplicateKeyError:
+            # The filter missed, so another owner holds the lease or ran this tick
+            return False
+
+    async def _renew(self, name: str, tick_key: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await db.job_locks.update_one(
+                    {"_id": name, "owner": self.owner, "tick": tick_key},
+                    {
+                        "$set": {
+                            "expires_at": datetime.utcnow()
+                            + timedelta(seconds=self.lease_seconds)
+                        }
+                    },
+                )
+            except Exception as e:
+                print(f"Failed to renew lease for {name}: {e}")
+
+    async def _release(self, name: str, tick_key: str):
+        # Keep the tick so late processes still skip it
+        await db.job_locks.update_one(
+            {"_id": name, "owner": self.owner, "tick": tick_key},
+            {"$set": {"expires_at": datetime.utcnow()}},
+        )
+
+    async def run(self, name: str, func, tick: datetime) -> dict | None:
+        """Run one tick of a job if this process wins its lease."""
+        tick_key = tick.isoformat()
+        try:
+            if not await self.acquire(name, tick_key):
+                return None
+        except Exception as e:
+            print(f"Failed to acquire lease for {name}: {e}")
+            return None
+
+        run = {
+            "job": name,
+            "tick": tick_key,
+            "owner": self.owner,
+            "started_at": datetime.utcnow(),
+            "status": "running",
+        }
+        try:
+            run_id = (await db.job_runs.insert_one(dict(run))).inserted_id
+        except Exception as e:
+            print(f"Failed to record run of {name}: {e}")
+            run_id = None
+
+        renewer = asyncio.create_task(self._renew(name, tick_key))
+        started = time.perf_counter()
+        result = {}
+        try:
+            # Jobs may report {"rows": int, "errors": [str]}
+            result = await func() or {}
+            run["status"] = "failed" if result.get("errors") else "ok"
+        except Exception as e:
+            print(f"Scheduled job {name} failed: {e}")
+            result = {"errors": [str(e)]}
+            run["status"] = "failed"
+        finally:
+            renewer.cancel()
+            run.update(
+                finished_at=datetime.utcnow(),
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+                rows=result.get("rows", 0),
+                errors=result.get("errors", []),
+            )
+            try:
+                await self._release(name, tick_key)
+                if run_id is not None:
+                    await db.job_runs.update_one({"_id": run_id}, {"$set": run})
+            except Exception as e:
+                print(f"Failed to finish run of {name}: {e}")
+        return run
+
+
+scheduler = Scheduler(lease_seconds=settings.SCHEDULER_LEASE_SECONDS)
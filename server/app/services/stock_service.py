@@ -1,7 +1,111 @@
-import yfinance as yf
+from app.core.config import settings
+from app.core.metrics import upstream_timer
+from app.utils.cache import TTLCache
+
+# Shared cache for upstream price lookups, keyed by (kind, symbol)
+quote_cache = TTLCache(maxsize=settings.QUOTE_CACHE_SIZE)
+
+QUOTE_TTLS = {
+    "quote": settings.QUOTE_TTL_SECONDS,
+    "previous_close": settings.PREVIOUS_CLOSE_TTL_SECONDS,
+}
+
+
+def _symbol_frame(data, symbol: str):
+    """Pick one symbol's OHLCV frame out of a multi-ticker download."""
+    import pandas as pd
+
+    if isinstance(data.columns, pd.MultiIndex):
+        if symbol not in data.columns.get_level_values(0):
+            return pd.DataFrame()
+        data = data[symbol]
+    return data.dropna(how="all")
+
+
+def _download_quotes(symbols: tuple, period: str) -> dict:
+    """Download all symbols in one request and derive a quote per symbol."""
+    # pandas and yfinance are imported on first use to keep startup fast
+    import pandas as pd
+    import yfinance as yf
+
+    with upstream_timer("yfinance", "download"):
+        data = yf.download(
+            list(symbols),
+            period=period,
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
+
+    quotes = {}
+    for symbol in symbols:
+        frame = _symbol_frame(data, symbol)
+        if frame.empty:
+            continue
+
+        latest = frame.iloc[-1]
+        volume = latest.get("Volume", 0)
+        quotes[symbol] = {
+            "symbol": symbol,
+            "current_price": round(float(latest["Close"]), 2),
+            "open_price": round(float(latest["Open"]), 2),
+            "high_price": round(float(latest["High"]), 2),
+            "low_price": round(float(latest["Low"]), 2),
+            "volume": 0 if pd.isna(volume) else int(volume),
+            "previous_close": (
+                round(float(frame["Close"].iloc[-2]), 2) if len(frame) > 1 else None
+            ),
+        }
+    return quotes
+
+
+def fetch_quotes(symbols: list[str]) -> dict:
+    """Return quotes for all symbols, fetching cache misses in one batched download."""
+    quotes = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols):
+        quote = quote_cache.get(("quote", symbol))
+        if quote is None:
+            missing.append(symbol)
+        else:
+            quotes[symbol] = quote
+
+    if not missing:
+        return quotes
+
+    # Previous closes only change once a day; when they are all cached a
+    # one-day frame is enough, otherwise fetch five days to derive them.
+    previous_closes = {
+        symbol: quote_cache.get(("previous_close", symbol)) for symbol in missing
+    }
+    period = "1d" if all(v is not None for v in previous_closes.values()) else "5d"
+
+    key = tuple(sorted(missing))
+    fetched = quote_cache.get_or_load(
+        ("download", key, period),
+        lambda: _download_quotes(key, period),
+        ttl=QUOTE_TTLS["quote"],
+    )
+
+    for symbol, quote in fetched.items():
+        if period == "5d":
+            if quote["previous_close"] is not None:
+                quote_cache.set(
+                    ("previous_close", symbol),
+                    quote["previous_close"],
+                    ttl=QUOTE_TTLS["previous_close"],
+                )
+        else:
+            quote = {**quote, "previous_close": previous_closes[symbol]}
+        quote_cache.set(("quote", symbol), quote, ttl=QUOTE_TTLS["quote"])
+        quotes[symbol] = quote
+
+    return quotes
 
 
 def fetch_stock_price(symbol: str):
-    stock = yf.Ticker(symbol)
-    history = stock.history(period="1d")
-    return history["Close"].iloc[-1]
+    quote = fetch_quotes([symbol]).get(symbol)
+    if quote is None:
+        raise ValueError(f"No data returned for symbol: {symbol}")
+    return quote["current_price"]
@@ -0,0 +1,156 @@
+import heapq
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from app.core.config import settings
+
+# Fields of the instrument master returned to clients
+RESULT_FIELDS = (
+    "SEM_SMST_SECURITY_ID",
+    "SEM_TRADING_SYMBOL",
+    "SEM_CUSTOM_SYMBOL",
+    "SEM_SERIES",
+    "SM_SYMBOL_NAME",
+)
+
+
+def _keys_with_prefix(keys: list[str], prefix: str):
+    """Yield positions of the sorted `keys` that start with `prefix`."""
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        yield i
+        i += 1
+
+
+class _Snapshot:
+    """Immutable sorted-key index over one version of the instrument master."""
+
+    def __init__(self, records: list[dict], mtime: float):
+        self.records = records
+        self.mtime = mtime
+
+        symbols = sorted(
+            (record["SEM_TRADING_SYMBOL"].upper(), i)
+            for i, record in enumerate(records)
+        )
+        self.symbols = [symbol for symbol, _ in symbols]
+        self.symbol_ids = [i for _, i in symbols]
+
+        # One entry per word of the security name, remembering its position
+        self.name_words = [record["SM_SYMBOL_NAME"].upper().split() for record in records]
+        words = sorted(
+            (word, i, position)
+            for i, name_words in enumerate(self.name_words)
+            for position, word in enumerate(name_words)
+        )
+        self.words = [word for word, _, _ in words]
+        self.word_ids = [i for _, i, _ in words]
+        self.word_positions = [position for _, _, position in words]
+        # Results for one- and two-letter queries, which match the most keys
+        self.short_results: dict[tuple, list[dict]] = {}
+
+
+class SymbolIndex:
+    """Prefix search over the NSE instrument master, reloaded when the file changes."""
+
+    def __init__(self, path: str, check_interval: float):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: _Snapshot | None = None
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Build a new snapshot from the file and swap it in."""
+        with self._lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if self._snapshot is not None and self._snapshot.mtime == mtime:
+                    return
+                with open(self.path, encoding="utf-8") as f:
+                    records = [
+                        {field: record.get(field) for field in RESULT_FIELDS}
+                        for record in json.load(f)
+                        if record.get("SEM_TRADING_SYMBOL")
+                    ]
+                for record in records:
+                    record["SM_SYMBOL_NAME"] = record["SM_SYMBOL_NAME"] or ""
+                self._snapshot = _Snapshot(records, mtime)
+                print(f"Loaded {len(records)} symbols from {self.path}")
+            except (OSError, ValueError) as e:
+                # Keep serving the previous snapshot if the new file is unusable
+                print(f"Failed to load symbol master {self.path}: {e}")
+            finally:
+                self._checked_at = time.monotonic()
+
+    def is_stale(self) -> bool:
+        """True if the file changed since the last load; stats it once per interval."""
+        if self._checked_at is None:
+            return True
+        if time.monotonic() - self._checked_at < self.check_interval:
+            # Also spaces out retries after a failed load
+            return False
+        if self._snapshot is None:
+            return True
+        self._checked_at = time.monotonic()
+        try:
+            return os.stat(self.path).st_mtime != self._snapshot.mtime
+        except OSError:
+            return False
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        """Rank exact symbol, symbol prefix, then name word prefix matches."""
+        snapshot = self._snapshot
+        terms = query.upper().split()
+        if snapshot is None or not terms:
+            return []
+
+        key = (" ".join(terms), limit)
+        if len(key[0]) <= 2 and key in snapshot.short_results:
+            return snapshot.short_results[key]
+
+        best = {}  # record id -> lowest rank key
+        if len(terms) == 1:
+            for i in _keys_with_prefix(snapshot.symbols, terms[0]):
+                symbol = snapshot.symbols[i]
+                best[snapshot.symbol_ids[i]] = (
+                    0 if symbol == terms[0] else 1,
+                    0,
+                    len(symbol),
+                    symbol,
+                )
+
+        # Every further term must also start one of the name's words
+        for i in _keys_with_prefix(snapshot.words, terms[0]):
+            record_id = snapshot.word_ids[i]
+            name_words = snapshot.name_words[record_id]
+            if not all(
+                any(word.startswith(term) for word in name_words) for term in terms[1:]
+            ):
+                continue
+            symbol = snapshot.records[record_id]["SEM_TRADING_SYMBOL"]
+            rank = (2, snapshot.word_positions[i], len(symbol), symbol)
+            if record_id not in best or rank < best[record_id]:
+                best[record_id] = rank
+
+        top = heapq.nsmallest(limit, best.items(), key=lambda item: item[1])
+        results = [snapshot.records[record_id] for record_id, _ in top]
+        if len(key[0]) <= 2:
+            snapshot.short_results[key] = results
+        return results
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "path": self.path,
+            "symbols": len(snapshot.records) if snapshot else 0,
+            "name_words": len(snapshot.words) if snapshot else 0,
+        }
+
+
+symbol_index = SymbolIndex(
+    path=settings.SYMBOL_MASTER_PATH,
+    check_interval=settings.SYMBOL_MASTER_CHECK_SECONDS,
+)
@@ -0,0 +1,36 @@
+from datetime import datetime
+from app.db import db
+
+# Resources whose GET responses are validated against a version counter
+SCANNERS = "scanners"
+
+
+def ledger(user_id: str) -> str:
+    """Version key of one user's balance and transactions."""
+    return f"ledger:{user_id}"
+
+
+def portfolio(user_id: str) -> str:
+    """Version key of one user's holdings."""
+    return f"portfolio:{user_id}"
+
+
+async def bump(resource: str):
+    """Record a write to `resource` so cached copies of it are revalidated."""
+    try:
+        await db.resource_versions.update_one(
+            {"_id": resource},
+            {"$inc": {"version": 1}, "$set": {"modified_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except Exception as e:
+        # Stale ETags then expire after ETAG_TTL_SECONDS
+        print(f"Failed to bump version of {resource}: {e}")
+
+
+async def current(resource: str) -> tuple[int, datetime | None]:
+    """Return (version, modified_at); (0, None) for a resource never written."""
+    doc = await db.resource_versions.find_one({"_id": resource})
+    if doc is None:
+        return 0, None
+    return doc["version"], doc["modified_at"]
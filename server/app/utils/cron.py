@@ -0,0 +1,12 @@
+from datetime import datetime
+
+
+def next_fire_time(cron: str) -> datetime:
+    """Next local time at which `cron` fires; also identifies the tick."""
+    from croniter import croniter
+
+    return croniter(cron, datetime.now()).get_next(datetime)
+
+
+def seconds_until_next(cron: str) -> float:
+    return (next_fire_time(cron) - datetime.now()).total_seconds()
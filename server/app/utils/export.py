@@ -0,0 +1,248 @@
+"""CSV streaming and PDF rendering for statement and holdings exports.
+
+PDF rendering (matplotlib and fpdf2) is CPU-bound, so the render_* functions
+run in worker processes through `render_pool`; they take and return plain
+picklable values.
+"""
+
+import asyncio
+import csv
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Literal
+from app.core.config import settings
+
+ExportFormat = Literal["csv", "pdf"]
+
+STATEMENT_COLUMNS = ["date", "type", "amount", "description"]
+
+# Weights need every holding at once, so they are left out of streamed rows
+HOLDING_EXPORT_COLUMNS = [
+    "symbol",
+    "quantity",
+    "purchase_price",
+    "current_price",
+    "previous_close",
+    "cost_basis",
+    "market_value",
+    "unrealized_pnl",
+    "unrealized_pnl_pct",
+    "day_change",
+]
+
+
+def _cell(value):
+    # Keep spreadsheet apps from evaluating text as a formula
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(columns: list[str], rows):
+    """Encode an async iterator of dicts as CSV, yielding a chunk of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    async for row in rows:
+        writer.writerow([_cell(row.get(column)) for column in columns])
+        count += 1
+        if count % settings.EXPORT_CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _text(value) -> str:
+    # The core PDF fonts only cover latin-1
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        value = f"{value:,.2f}"
+    elif isinstance(value, datetime):
+        value = value.strftime("%Y-%m-%d %H:%M")
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+def _chart_png(draw, width: float = 8, height: float = 3.2) -> bytes:
+    """Render a chart drawn by `draw(ax)` to PNG bytes."""
+    # Figure is used without pyplot, so no global state or GUI backend
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(width, height), dpi=120)
+    draw(fig.subplots())
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def _new_pdf(title: str, lines: list[str]):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", "B", 16)
+    pdf.cell(0, 10, _text(title), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", size=10)
+    for line in lines:
+        pdf.cell(0, 6, _text(line), new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(4)
+    return pdf
+
+
+def _add_table(pdf, columns: list[str], rows: list[list]):
+    pdf.set_font("Helvetica", size=8)
+    with pdf.table(text_align="LEFT", line_height=5) as table:
+        table.row(columns)
+        for row in rows:
+            table.row([_text(value) for value in row])
+
+
+def render_statement_pdf(account: dict, transactions: list[dict], truncated: bool) -> bytes:
+    """Statement report: account summary, cumulative net flow chart and ledger table."""
+    pdf = _new_pdf(
+        "Account statement",
+        [
+            f"Account number: {account['account_number']}",
+            f"Balance: {account['account_balance']:,.2f}",
+            f"Transactions: {len(transactions)}"
+            + (" (most recent only)" if truncated else ""),
+            f"Generated: {datetime.utcnow():%Y-%m-%d %H:%M} UTC",
+        ],
+    )
+
+    if transactions:
+        # Transactions arrive newest first
+        ordered = transactions[::-1]
+        dates = [t["date"] for t in ordered]
+        net = []
+        total = 0.0
+        for t in ordered:
+            total += t["amount"] if t["type"] == "deposit" else -t["amount"]
+            net.append(total)
+
+        def draw(ax):
+            ax.step(dates, net, where="post")
+            ax.set_title("Cumulative net flow")
+            ax.grid(alpha=0.3)
+            ax.figure.autofmt_xdate()
+
+        pdf.image(io.BytesIO(_chart_png(draw)), w=pdf.epw)
+        pdf.ln(4)
+
+    _add_table(
+        pdf,
+        ["Date", "Type", "Description", "Amount"],
+        [[t["date"], t["type"], t.get("description"), t["amount"]] for t in transactions],
+    )
+    return bytes(pdf.output())
+
+
+def render_holdings_pdf(name: str, valuation: dict) -> bytes:
+    """Holdings report: valuation summary, allocation chart and holdings table."""
+    summary = valuation["summary"]
+    holdings = valuation["holdings"]
+    pdf = _new_pdf(
+        f"Portfolio report - {name}",
+        [
+            f"Cost basis: {summary['cost_basis']:,.2f}",
+            f"Market value: {summary['market_value']:,.2f}",
+            f"Unrealized P&L: {summary['unrealized_pnl']:,.2f}",
+            f"Day change: {summary['day_change']:,.2f}",
+            f"Generated: {datetime.utcnow():%Y-%m-%d %H:%M} UTC",
+        ],
+    )
+
+    valued = sorted(
+        (h for h in holdings if h["market_value"]),
+        key=lambda h: h["market_value"],
+        reverse=True,
+    )
+    if valued:
+        # Largest ten positions, the rest grouped together
+        labels = [h["symbol"] for h in valued[:10]]
+        values = [h["market_value"] for h in valued[:10]]
+        if len(valued) > 10:
+            labels.append("Other")
+            values.append(sum(h["market_value"] for h in valued[10:]))
+
+        def draw(ax):
+            ax.barh(labels[::-1], values[::-1])
+            ax.set_title("Allocation by market value")
+            ax.grid(axis="x", alpha=0.3)
+
+        pdf.image(io.BytesIO(_chart_png(draw)), w=pdf.epw)
+        pdf.ln(4)
+
+    _add_table(
+        pdf,
+        ["Symbol", "Qty", "Avg price", "Price", "Value", "P&L", "P&L %", "Weight %"],
+        [
+            [
+                h["symbol"],
+                h["quantity"],
+                h["purchase_price"],
+                h["current_price"],
+                h["market_value"],
+                h["unrealized_pnl"],
+                h["unrealized_pnl_pct"],
+                h["weight"],
+            ]
+            for h in holdings
+        ],
+    )
+    return bytes(pdf.output())
+
+
+class RenderPool:
+    """Runs report rendering in worker processes, away from the event loop."""
+
+    def __init__(self, workers: int, tasks_per_worker: int):
+        self.workers = workers
+        self.tasks_per_worker = tasks_per_worker
+        self._executor = None
+        self._submitted = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Replace the pool after a number of renders to bound matplotlib's
+        # memory growth (max_tasks_per_child needs Python 3.11); renders
+        # already running finish on the old workers
+        if self._executor is not None and (
+            self._submitted >= self.workers * self.tasks_per_worker
+        ):
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            # spawn: forking a process that runs motor's threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._submitted = 0
+        self._submitted += 1
+        return self._executor
+
+    async def run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next render
+            self.close()
+            raise
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_pool = RenderPool(settings.EXPORT_WORKERS, settings.EXPORT_TASKS_PER_WORKER)
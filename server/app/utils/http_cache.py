@@ -0,0 +1,118 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from app.core.config import settings
+from app.services import versions
+from app.utils.cache import TTLCache
+
+# (resource, version, query) -> (ETag, Last-Modified) of the body last served
+_validators = TTLCache(maxsize=settings.ETAG_CACHE_SIZE, ttl=settings.ETAG_TTL_SECONDS)
+
+
+def _opaque(etag: str) -> str:
+    return etag.removeprefix("W/").strip()
+
+
+class Validator:
+    """ETag and Last-Modified handling for one GET of a resource."""
+
+    def __init__(
+        self,
+        request: Request,
+        resource: str,
+        version: int | None = None,
+        modified_at: datetime | None = None,
+        cache_control: str = "no-cache",
+    ):
+        self.request = request
+        self.version = version
+        self.modified_at = modified_at
+        self.cache_control = cache_control
+        # The token is a query parameter but does not change the body
+        query = sorted(
+            (k, v) for k, v in request.query_params.multi_items() if k != "token"
+        )
+        self.key = (resource, version, request.url.path, tuple(query))
+
+    def headers(self, etag: str, modified_at: datetime) -> dict:
+        return {
+            "ETag": etag,
+            "Last-Modified": format_datetime(
+                modified_at.replace(tzinfo=timezone.utc), usegmt=True
+            ),
+            "Cache-Control": self.cache_control,
+        }
+
+    def is_fresh(self, etag: str, modified_at: datetime) -> bool:
+        """Whether the client's copy matches, per If-None-Match or If-Modified-Since."""
+        if_none_match = self.request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {_opaque(tag) for tag in if_none_match.split(",")}
+            return "*" in tags or _opaque(etag) in tags
+
+        if_modified_since = self.request.headers.get("if-modified-since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is not None:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        return modified_at.replace(microsecond=0) <= since
+
+    def check(self):
+        """Raise 304 if the client already has the body for this version."""
+        if self.version is None:
+            return
+        cached = _validators.get(self.key)
+        if cached is not None and self.is_fresh(*cached):
+            raise HTTPException(status_code=304, headers=self.headers(*cached))
+
+    def respond(self, content) -> Response:
+        """Serialize `content` with a content-hash ETag, or 304 if unchanged."""
+        body = ORJSONResponse(content).body
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+        modified_at = self.modified_at
+        if modified_at is None:
+            # Unversioned: last modified when the body last changed here
+            cached = _validators.get(self.key)
+            if cached is not None and cached[0] == etag:
+                modified_at = cached[1]
+            else:
+                modified_at = datetime.utcnow()
+        _validators.set(self.key, (etag, modified_at))
+
+        headers = self.headers(etag, modified_at)
+        if self.is_fresh(etag, modified_at):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+
+async def conditional_get(
+    request: Request, resource: str, cache_control: str = "no-cache"
+) -> Validator:
+    """Validator for a versioned resource; answers 304 before the handler runs."""
+    version, modified_at = await versions.current(resource)
+    validator = Validator(request, resource, version, modified_at, cache_control)
+    validator.check()
+    return validator
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZip bodies above a size threshold, except on streaming endpoints."""
+
+    def __init__(self, app, exclude_paths: tuple[str, ...] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        # Compressing Server-Sent Events would hold them in the gzip buffer
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
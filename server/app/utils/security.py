@@ -1,12 +1,26 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, Depends
+from datetime import datetime, timedelta
+from app.core.config import settings
 from app.db import db
+from app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a different cost factor are reported by needs_update()
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 SECRET_KEY = "your_secret_key"
 ALGORITHM = "HS256"
 
+# Authenticated user records keyed by token subject (contact number)
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -16,15 +30,107 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class HashingPool:
+    """Runs bcrypt on a few worker threads so it never blocks the event loop."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.max_queued = 0
+
+    def _call(self, func, *args):
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    async def run(self, func, *args):
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, *args)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "max_queued": self.max_queued,
+            }
+
+
+hashing_pool = HashingPool(settings.HASH_WORKERS)
+
+
+async def hash_password_async(password: str) -> str:
+    return await hashing_pool.run(hash_password, password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify off the event loop; also return a new hash if the old one is outdated."""
+    return await hashing_pool.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
-    return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
+    """Sign a token that expires and carries the user's token version."""
+    to_encode = data.copy()
+    to_encode.setdefault("ver", 0)
+    to_encode["exp"] = datetime.utcnow() + timedelta(
+        minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+    )
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def invalidate_user(contact_number: str):
+    """Drop a cached user after their record changes.
 
+    Only this process's cache is cleared; other workers see the change once
+    their entry expires (USER_CACHE_TTL_SECONDS).
+    """
+    user_cache.invalidate(contact_number)
 
-def get_current_user(token: str):
+
+async def get_current_user(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user = db.users.find_one({"contact_number": payload.get("sub")})
-        if user:
-            return user
+        payload = jwt.decode(
+            token,
+            SECRET_KEY,
+            algorithms=[ALGORITHM],
+            options={"require_exp": True, "require_sub": True},
+        )
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    # Tokens without a version cannot be revoked
+    if "ver" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    contact_number = payload.get("sub")
+    user = user_cache.get(contact_number)
+    if user is None:
+        user = await db.users.find_one({"contact_number": contact_number})
+        if not user:
+            return None
+        user_cache.set(contact_number, user)
+
+    # Tokens issued before the last password change are revoked
+    if payload["ver"] != user.get("token_version", 0):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return user
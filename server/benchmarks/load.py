@@ -0,0 +1,289 @@
+"""Closed-loop load test of the API against local stand-ins.
+
+Boots the app in a subprocess (see benchmarks.server), seeds one user per
+virtual user, then drives a weighted mix of endpoints and reports latency
+percentiles and throughput per endpoint. Run from server/:
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.load --mix default --duration 30 --concurrency 20 \\
+        --output benchmarks/results/latest.json \\
+        --baseline benchmarks/results/baseline.json
+
+Exits non-zero if --fail-on-regression is set and p95 latency or throughput
+of any endpoint is worse than the baseline by more than --threshold percent.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from benchmarks import report
+from benchmarks.standins import CHARTINK_TABLE_ID
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchmark-password"
+
+
+async def login(client, user, ctx):
+    return await client.post(
+        "/auth/login", params={"contact_number": user["contact"], "password": PASSWORD}
+    )
+
+
+async def deposit(client, user, ctx):
+    return await client.post(
+        "/bank/deposit", params={"amount": 100, "token": user["token"]}
+    )
+
+
+async def statement(client, user, ctx):
+    return await client.get(
+        "/bank/statement", params={"limit": 50, "token": user["token"]}
+    )
+
+
+async def market_summary(client, user, ctx):
+    return await client.get("/market/market-summary")
+
+
+async def get_scanners(client, user, ctx):
+    return await client.get("/scanner/get_scanners")
+
+
+async def scrape_table(client, user, ctx):
+    return await client.post(
+        "/scrape/table",
+        json={
+            "url": ctx["chartink_url"],
+            "table_id": CHARTINK_TABLE_ID,
+            "scrape_mode": "http",
+        },
+    )
+
+
+OPERATIONS = {
+    "auth.login": login,
+    "bank.deposit": deposit,
+    "bank.statement": statement,
+    "market.market_summary": market_summary,
+    "scanner.get_scanners": get_scanners,
+    "scrape.table": scrape_table,
+}
+
+# Relative weights of each operation per traffic mix
+MIXES = {
+    "default": {
+        "auth.login": 5,
+        "bank.deposit": 15,
+        "bank.statement": 20,
+        "market.market_summary": 30,
+        "scanner.get_scanners": 20,
+        "scrape.table": 10,
+    },
+    "dashboard": {
+        "market.market_summary": 50,
+        "scanner.get_scanners": 30,
+        "scrape.table": 20,
+    },
+    "ledger": {
+        "auth.login": 5,
+        "bank.deposit": 45,
+        "bank.statement": 50,
+    },
+}
+
+
+def start_server(args) -> tuple[subprocess.Popen, str]:
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.server",
+        "--port",
+        str(args.port),
+        "--yfinance-latency-ms",
+        str(args.yfinance_latency_ms),
+        "--chartink-latency-ms",
+        str(args.chartink_latency_ms),
+    ]
+    if args.mongo_url:
+        command += ["--mongo-url", args.mongo_url]
+
+    process = subprocess.Popen(
+        command, cwd=SERVER_DIR, stdout=subprocess.PIPE, text=True
+    )
+    for line in process.stdout:
+        if line.startswith("CHARTINK_URL="):
+            return process, line.strip().split("=", 1)[1]
+    process.wait()
+    raise RuntimeError(f"Benchmark server exited with code {process.returncode}")
+
+
+async def wait_until_ready(client, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Benchmark server did not become ready")
+
+
+async def seed(client, count: int, ctx: dict) -> list[dict]:
+    """Register one user per virtual user, log them in and add a scanner."""
+    users = []
+    for i in range(count):
+        contact = f"9{i:09d}"
+        response = await client.post(
+            "/auth/register",
+            json={"name": f"Bench {i}", "contact_number": contact, "password": PASSWORD},
+        )
+        if response.status_code not in (200, 400):
+            raise RuntimeError(f"Failed to register user: {response.text}")
+        token = (await login(client, {"contact": contact}, ctx)).json()["access_token"]
+        users.append({"contact": contact, "token": token})
+
+    await client.post(
+        "/scanner/add_scanner",
+        json={
+            "name": "Benchmark fixture",
+            "url": ctx["chartink_url"],
+            "description": "Static Chartink table served by the benchmark",
+            "table_id": CHARTINK_TABLE_ID,
+            "scrape_mode": "http",
+        },
+    )
+    return users
+
+
+async def virtual_user(client, user, ctx, mix, rng, stop_at, samples):
+    names = list(mix)
+    weights = list(mix.values())
+    while time.monotonic() < stop_at:
+        name = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, user, ctx)
+            ok = response.status_code < 400
+        except Exception:
+            ok = False
+        samples.append((name, time.perf_counter() - started, ok))
+
+
+async def drive(args, base_url: str, chartink_url: str) -> dict:
+    import httpx
+
+    ctx = {"chartink_url": chartink_url}
+    mix = MIXES[args.mix]
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=args.request_timeout, limits=limits
+    ) as client:
+        await wait_until_ready(client)
+        users = await seed(client, args.concurrency, ctx)
+
+        rng = random.Random(args.seed)
+        for phase, seconds in (("warmup", args.warmup), ("measure", args.duration)):
+            samples = []
+            stop_at = time.monotonic() + seconds
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        client, user, ctx, mix, random.Random(rng.random()), stop_at, samples
+                    )
+                    for user in users
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in mix:
+        latencies = [latency for op, latency, ok in samples if op == name and ok]
+        errors = sum(1 for op, _, ok in samples if op == name and not ok)
+        endpoints[name] = report.summarize_latencies(latencies, errors, elapsed)
+    endpoints["overall"] = report.summarize_latencies(
+        [latency for _, latency, ok in samples if ok],
+        sum(1 for _, _, ok in samples if not ok),
+        elapsed,
+    )
+    return endpoints
+
+
+def print_table(endpoints: dict):
+    print(
+        f"\n{'endpoint':24} {'requests':>9} {'errors':>7} {'rps':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for name, s in endpoints.items():
+        print(
+            f"{name:24} {s['requests']:>9} {s['errors']:>7} {s['throughput_rps']:>9} "
+            f"{s['p50_ms']:>9} {s['p95_ms']:>9} {s['p99_ms']:>9}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mix", choices=MIXES, default="default")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds measured")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds discarded")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--request-timeout", type=float, default=30)
+    parser.add_argument("--mongo-url", help="Use a real MongoDB, e.g. a local mongod")
+    parser.add_argument("--yfinance-latency-ms", type=float, default=80)
+    parser.add_argument("--chartink-latency-ms", type=float, default=150)
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10, help="Percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    process, chartink_url = start_server(args)
+    try:
+        endpoints = asyncio.run(
+            drive(args, f"http://127.0.0.1:{args.port}", chartink_url)
+        )
+    finally:
+        process.terminate()
+        process.wait()
+
+    print_table(endpoints)
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("output", "baseline", "fail_on_regression")
+    }
+    config["mongo"] = "external" if args.mongo_url else "in-memory"
+    config.pop("mongo_url")
+    result = {
+        "kind": "load",
+        "environment": report.environment(),
+        "config": config,
+        "endpoints": endpoints,
+    }
+    report.save(result, args.output)
+
+    baseline = report.load_baseline(args.baseline)
+    if baseline is None:
+        return 0
+    if baseline["config"].get("mix") != args.mix:
+        print("Baseline used a different mix; comparison may not be meaningful")
+    regressions = report.compare(
+        endpoints,
+        baseline["endpoints"],
+        {"p95_ms": False, "throughput_rps": True},
+        args.threshold,
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
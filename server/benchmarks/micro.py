@@ -0,0 +1,117 @@
+"""Micro-benchmarks of the hot in-process code paths.
+
+Each case is timed with timeit (best of several repeats) and reported as
+microseconds per call. Run from server/:
+
+    python -m benchmarks.micro --output benchmarks/results/micro.json \\
+        --baseline benchmarks/results/micro-baseline.json
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+from bson import ObjectId
+from benchmarks import report
+from benchmarks.standins import CHARTINK_FIXTURE, CHARTINK_TABLE_ID
+
+os.environ.setdefault("CLIENT_URL", "http://localhost")
+
+
+def cases() -> dict:
+    """Name -> zero-argument callable, built on fixture data."""
+    from app.core.metrics import Histogram
+    from app.routes.scrape_table import parse_table
+    from app.services.ledger import decode_cursor, encode_cursor
+    from app.services.notifier import build_digest_email
+    from app.services.portfolio_service import value_holdings
+    from app.services.scan_service import dedupe_stocks
+    from app.services.symbol_index import symbol_index
+    from app.utils.cache import TTLCache
+
+    with open(CHARTINK_FIXTURE) as f:
+        html = f.read()
+    rows = parse_table(html, CHARTINK_TABLE_ID)
+    scan_results = [{"name": f"scanner {i}", "rows": rows} for i in range(3)]
+
+    symbol_index.load()
+
+    cache = TTLCache(maxsize=1024, ttl=60)
+    cache.set("hit", 1)
+
+    holdings = [
+        {"symbol": row["Symbol"], "quantity": 10, "purchase_price": float(row["Price"])}
+        for row in rows
+    ]
+    quotes = {
+        row["Symbol"]: {
+            "current_price": float(row["Price"]) * 1.01,
+            "previous_close": float(row["Price"]),
+        }
+        for row in rows
+    }
+
+    cursor = encode_cursor({"date": datetime.utcnow(), "_id": ObjectId()})
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ("route",))
+
+    return {
+        "symbol_search.prefix": lambda: symbol_index.search("inf", 10),
+        "symbol_search.words": lambda: symbol_index.search("hdfc bank", 10),
+        "cache.get_hit": lambda: cache.get("hit"),
+        "scrape.parse_table": lambda: parse_table(html, CHARTINK_TABLE_ID),
+        "scan.dedupe_stocks": lambda: dedupe_stocks(scan_results),
+        "portfolio.value_holdings": lambda: value_holdings(holdings, quotes),
+        "ledger.decode_cursor": lambda: decode_cursor(cursor),
+        "notifier.build_digest_email": lambda: build_digest_email(rows),
+        "metrics.observe": lambda: histogram.observe(0.01, "/market/quotes"),
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"per_call_us": round(best * 1e6, 3), "calls_per_repeat": number}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--output", default="benchmarks/results/micro.json")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=10, help="Percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in cases().items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        print(f"{name:32} {results[name]['per_call_us']:>12} us")
+
+    report.save(
+        {
+            "kind": "micro",
+            "environment": report.environment(),
+            "config": {"repeat": args.repeat},
+            "benchmarks": results,
+        },
+        args.output,
+    )
+
+    baseline = report.load_baseline(args.baseline)
+    if baseline is None:
+        return 0
+    regressions = report.compare(
+        results, baseline["benchmarks"], {"per_call_us": False}, args.threshold
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
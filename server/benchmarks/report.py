@@ -0,0 +1,96 @@
+"""Summaries, JSON results and baseline comparison shared by the benchmarks."""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of `values`, with q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_latencies(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Latency percentiles in ms plus throughput for one endpoint or the total."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save(result: dict, path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Saved results to {path}")
+
+
+def compare(
+    current: dict, baseline: dict, metrics: dict[str, bool], threshold: float
+) -> list[str]:
+    """Print per-entry changes against a baseline and return the regressions.
+
+    `current` and `baseline` map entry names to metric dicts. `metrics` maps
+    each compared metric to True when higher is better. A change counts as a
+    regression when it is worse by more than `threshold` percent.
+    """
+    regressions = []
+    print(f"\n{'entry':32} {'metric':16} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, values in current.items():
+        if name not in baseline:
+            continue
+        for metric, higher_is_better in metrics.items():
+            old, new = baseline[name].get(metric), values.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric} {change:+.1f}%")
+            print(f"{name:32} {metric:16} {old:>12} {new:>12} {change:>+8.1f}%{flag}")
+    return regressions
+
+
+def load_baseline(path: str | None) -> dict | None:
+    if not path:
+        return None
+    if not os.path.exists(path):
+        print(f"No baseline at {path}; skipping comparison")
+        return None
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,58 @@
+"""Boot app.main:app against the local stand-ins.
+
+Started as a subprocess by benchmarks.load, so the app gets its own interpreter
+and event loop. It can also be run by hand from server/:
+
+    python -m benchmarks.server --port 8900
+"""
+
+import argparse
+import os
+from benchmarks import standins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument(
+        "--mongo-url", help="Use a real MongoDB instead of the in-memory stand-in"
+    )
+    parser.add_argument("--yfinance-latency-ms", type=float, default=80)
+    parser.add_argument("--chartink-latency-ms", type=float, default=150)
+    args = parser.parse_args()
+
+    standins.install_fake_yfinance(args.yfinance_latency_ms / 1000)
+    chartink_url = standins.start_chartink_fixture(args.chartink_latency_ms / 1000)
+    smtp_port = standins.start_smtp_sink()
+
+    # Settings are read from the environment when the app is imported
+    os.environ.update(
+        {
+            "CLIENT_URL": "http://localhost",
+            "CRON_JOB_TIME": "0 0 1 1 *",
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(smtp_port),
+            "SMTP_STARTTLS": "false",
+            "EMAIL_PASSWORD": "",
+            "SENDER_EMAIL": "bench@localhost",
+            "RECEIVER_EMAIL": "bench@localhost",
+            "HISTORY_STORE_DIR": os.path.join("benchmarks", "results", "history"),
+        }
+    )
+    if args.mongo_url:
+        os.environ["DATABASE_URL"] = args.mongo_url
+    else:
+        standins.install_in_memory_mongo()
+
+    import uvicorn
+    from app.main import app
+
+    # The load driver reads this line to find the scanner fixture
+    print(f"CHARTINK_URL={chartink_url}/screener/benchmark", flush=True)
+    uvicorn.run(
+        app, host="127.0.0.1", port=args.port, log_level="warning", access_log=False
+    )
+
+
+if __name__ == "__main__":
+    main()
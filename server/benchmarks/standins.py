@@ -0,0 +1,242 @@
+"""Local stand-ins for the app's upstream dependencies.
+
+Each stand-in adds a configurable delay so that caching and batching show up in
+the numbers the way they would against the real services.
+"""
+
+import http.server
+import os
+import socketserver
+import sys
+import threading
+import time
+import types
+import zlib
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+CHARTINK_FIXTURE = os.path.join(FIXTURES_DIR, "chartink_scanner.html")
+CHARTINK_TABLE_ID = "DataTables_Table_0"
+
+PERIOD_ROWS = {"1d": 1, "5d": 5, "1mo": 22, "1y": 250, "5y": 1250, "730d": 730}
+
+
+def _canned_frame(symbol: str, rows: int, freq: str = "D"):
+    """Deterministic OHLCV bars for a symbol, ending today."""
+    import numpy as np
+    import pandas as pd
+
+    index = pd.date_range(
+        end=pd.Timestamp.now(tz="UTC").normalize(), periods=rows, freq=freq
+    )
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    close = 100 + rng.normal(0, 1, rows).cumsum()
+    return pd.DataFrame(
+        {
+            "Open": close - 0.5,
+            "High": close + 1.0,
+            "Low": close - 1.0,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(10_000, 1_000_000, rows),
+        },
+        index=index,
+    )
+
+
+def install_fake_yfinance(latency: float):
+    """Register a `yfinance` module that serves canned frames after `latency` s."""
+    import pandas as pd
+
+    module = types.ModuleType("yfinance")
+
+    def download(tickers, period="1d", group_by="column", **kwargs):
+        time.sleep(latency)
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        rows = PERIOD_ROWS.get(period, 5)
+        frames = {symbol: _canned_frame(symbol, rows) for symbol in symbols}
+        if len(symbols) == 1 and group_by != "ticker":
+            return frames[symbols[0]]
+        return pd.concat(frames, axis=1)
+
+    class Ticker:
+        def __init__(self, symbol: str):
+            self.symbol = symbol
+
+        @property
+        def info(self) -> dict:
+            time.sleep(latency)
+            close = float(_canned_frame(self.symbol, 2)["Close"].iloc[-1])
+            return {
+                "longName": f"{self.symbol} Limited",
+                "marketCap": 25_000 * 1e7,
+                "sector": "Technology",
+                "industry": "IT Services",
+                "trailingPE": 24.5,
+                "previousClose": round(close - 1, 2),
+                "currentPrice": round(close, 2),
+                "fiftyTwoWeekLow": round(close * 0.8, 2),
+                "fiftyTwoWeekHigh": round(close * 1.2, 2),
+                "open": round(close - 0.5, 2),
+                "volume": 1_000_000,
+            }
+
+        def history(self, period=None, interval="1d", start=None, **kwargs):
+            time.sleep(latency)
+            return _canned_frame(self.symbol, PERIOD_ROWS.get(period, 5))
+
+    module.download = download
+    module.Ticker = Ticker
+    sys.modules["yfinance"] = module
+
+
+def install_in_memory_mongo():
+    """Make the app's motor client an in-memory mongomock database."""
+    import mongomock.collection
+    import mongomock.database
+    import mongomock_motor
+    import motor.motor_asyncio
+    from pymongo import IndexModel
+
+    # mongomock ignores partialFilterExpression, which would turn partial
+    # unique indexes (e.g. transaction references) into full unique ones
+    create_indexes = mongomock.collection.Collection.create_indexes
+
+    def create_supported_indexes(self, indexes, *args, **kwargs):
+        supported = []
+        for index in indexes:
+            document = dict(index.document)
+            if "partialFilterExpression" in document:
+                document.pop("partialFilterExpression")
+                document.pop("unique", None)
+                keys = list(document.pop("key").items())
+                document.pop("name", None)
+                index = IndexModel(keys, **document)
+            supported.append(index)
+        return create_indexes(self, supported, *args, **kwargs)
+
+    mongomock.collection.Collection.create_indexes = create_supported_indexes
+
+    # Time-series options are not supported either; use a plain collection
+    create_collection = mongomock.database.Database.create_collection
+
+    def create_plain_collection(self, name, **kwargs):
+        kwargs.pop("timeseries", None)
+        return create_collection(self, name, **kwargs)
+
+    mongomock.database.Database.create_collection = create_plain_collection
+
+    motor.motor_asyncio.AsyncIOMotorClient = (
+        lambda *args, **kwargs: mongomock_motor.AsyncMongoMockClient()
+    )
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+CHARTINK_SHELL = """<!DOCTYPE html>
+<html>
+<head><meta name="csrf-token" content="benchmark-token"></head>
+<body>
+    <textarea name="scan_clause">( {cash} ( latest close > 1 ) )</textarea>
+    <table id="%s"><thead><tr><th>Sr.</th></tr></thead><tbody></tbody></table>
+</body>
+</html>
+""" % CHARTINK_TABLE_ID
+
+
+def _chartink_results() -> bytes:
+    """The fixture table as the JSON Chartink's /screener/process returns."""
+    import json
+    from lxml import html as lxml_html
+
+    doc = lxml_html.parse(CHARTINK_FIXTURE)
+    data = []
+    for row in doc.xpath(f"//table[@id='{CHARTINK_TABLE_ID}']/tbody/tr"):
+        sr, name, symbol, _, per_chg, close, volume = (
+            td.text_content().strip() for td in row.xpath("./td")
+        )
+        data.append(
+            {
+                "sr": int(sr),
+                "name": name,
+                "nsecode": symbol,
+                "per_chg": float(per_chg.rstrip("%")),
+                "close": float(close),
+                "volume": int(volume),
+            }
+        )
+    return json.dumps({"draw": 1, "recordsTotal": len(data), "data": data}).encode()
+
+
+def start_chartink_fixture(latency: float) -> str:
+    """Serve Chartink's page shell and JSON scan endpoint; returns the base URL.
+
+    Like the real site, the page's results table is empty and is filled from
+    POST /screener/process, so HTTP scraping must go through the JSON path.
+    """
+    shell = CHARTINK_SHELL.encode()
+    results = _chartink_results()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _reply(self, body: bytes, content_type: str):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(shell, "text/html; charset=utf-8")
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path != "/screener/process" or not self.headers.get("X-CSRF-TOKEN"):
+                self.send_error(419)
+                return
+            self._reply(results, "application/json")
+
+        def log_message(self, *args):
+            pass
+
+    server = _Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept and discard messages."""
+
+    def handle(self):
+        def reply(line: str):
+            self.wfile.write(f"{line}\r\n".encode())
+
+        reply("220 benchmark sink")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode(errors="replace").rstrip("\r\n")
+            if in_data:
+                if line == ".":
+                    in_data = False
+                    self.server.messages += 1
+                    reply("250 queued")
+                continue
+            command = line[:4].upper()
+            if command == "DATA":
+                in_data = True
+                reply("354 end with <CRLF>.<CRLF>")
+            elif command == "QUIT":
+                reply("221 bye")
+                return
+            else:
+                reply("250 ok")
+
+
+def start_smtp_sink() -> int:
+    """Accept SMTP on a local port and count messages; returns the port."""
+    server = _Server(("127.0.0.1", 0), _SMTPHandler)
+    server.messages = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_address[1]
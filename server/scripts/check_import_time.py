@@ -0,0 +1,69 @@
+"""Fail the build if importing the app gets slower than the startup budget.
+
+Runs `python -X importtime -c "import app.main"` a few times in fresh
+interpreters, takes the fastest run and compares it against the budget:
+
+    python scripts/check_import_time.py --budget-ms 1500
+
+The budget can also be set with IMPORT_TIME_BUDGET_MS.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(module: str) -> dict:
+    """Return cumulative import time in microseconds per module for one run."""
+    env = {"CLIENT_URL": "http://localhost", **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        timings[name] = max(timings.get(name, 0), int(cumulative))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500)),
+    )
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    best = min(runs, key=lambda timings: timings[args.module])
+    total_ms = best[args.module] / 1000
+
+    print(f"Slowest imports under {args.module}:")
+    for name, cumulative in sorted(best.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+    print(f"\nimport {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if total_ms > args.budget_ms:
+        print("Import time budget exceeded")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())